@@ -6,23 +6,171 @@ Search across ALL NZ Pokemon TCG stores for the new set
 
 import asyncio
 import logging
-import time
 import random
-from typing import List, Dict, Any
+import re
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, Tuple, Callable
+import aiohttp
+from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+from utils import jsonio
+from utils.cache import async_memoize
+from utils.helpers import format_price
+from utils.logger import start_queue_logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Real browser user agents - never send library defaults (python-requests, aiohttp,
+# HeadlessChrome, Go-http-client) as those are blocklisted by most bot protections
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+
+]
+
+# Stealth options to avoid detection, plus flags that skip resources we never read.
+# JavaScript stays enabled because Cloudflare challenges need it.
+_CHROME_ARGS = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--blink-settings=imagesEnabled=false',
+    '--disable-extensions',
+    '--disable-gpu',
+    '--disable-background-networking',
+)
+
+# Only the DOM text is scraped, so block images, stylesheets and fonts
+_CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2
+}
+
+# Hide the usual headless/automation fingerprints checked by Cloudflare and DataDome
+_STEALTH_JS = """
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+Object.defineProperty(navigator, 'languages', {get: () => ['en-NZ', 'en']});
+Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+window.chrome = window.chrome || {runtime: {}};
+"""
+
+class DriverPool:
+    """Keeps warm stealth Chrome drivers around and leases them out to searches"""
+    
+    def __init__(self, factory: Callable[[], webdriver.Chrome], size: int = 2):
+        self.factory = factory
+        self.size = size
+        self._drivers: List[webdriver.Chrome] = []
+        # Created lazily so they bind to the running event loop
+        self._idle: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+    
+    async def acquire(self) -> webdriver.Chrome:
+        """Wait for a free slot and return an idle driver, starting one if none are warm"""
+        if self._slots is None:
+            self._idle = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.size)
+        
+        await self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        
+        try:
+            driver = await asyncio.to_thread(self.factory)
+        except Exception:
+            self._slots.release()
+            raise
+        self._drivers.append(driver)
+        return driver
+    
+    async def release(self, driver: webdriver.Chrome):
+        """Reset a driver's state and return it to the pool (or drop it if it broke)"""
+        try:
+            await asyncio.to_thread(driver.delete_all_cookies)
+            await asyncio.to_thread(driver.get, "about:blank")
+            self._idle.put_nowait(driver)
+        except Exception:
+            self._drivers.remove(driver)
+            try:
+                await asyncio.to_thread(driver.quit)
+            except Exception:
+                pass
+        finally:
+            self._slots.release()
+    
+    @asynccontextmanager
+    async def lease(self):
+        """Borrow a driver for the duration of an async with block"""
+        driver = await self.acquire()
+        try:
+            yield driver
+        finally:
+            await self.release(driver)
+    
+    async def close(self):
+        """Quit every driver the pool has started"""
+        for driver in self._drivers:
+            try:
+                await asyncio.to_thread(driver.quit)
+            except Exception:
+                pass
+        self._drivers.clear()
+        self._idle = None
+        self._slots = None
+
 class AdvancedPhantasmalSearcher:
-    def __init__(self):
+    # Product name terms that indicate a Phantasmal Flames listing
+    _KEYWORDS = ('phantasmal', 'phantom', 'flames')
+    _NAME_RE = re.compile('|'.join(_KEYWORDS), re.IGNORECASE)
+    # True while a Cloudflare interstitial is still on screen
+    _CF_CHALLENGE_JS = (
+        "return !!document.querySelector("
+        "'#challenge-form, .cf-spinner, .cf-browser-verification, [data-translate=\"checking_browser\"]')"
+    )
+    # Collects name/price/link for the first N product containers in a single round-trip,
+    # keeping at most maxMatches rows whose name matches the keyword pattern
+    _EXTRACT_JS = """
+        const [productSel, nameSel, priceSel, limit, pattern, maxMatches] = arguments;
+        const nameRe = new RegExp(pattern, 'i');
+        return Array.from(document.querySelectorAll(productSel)).slice(0, limit).map(c => {
+            const nameEl = c.querySelector(nameSel);
+            const priceEl = c.querySelector(priceSel);
+            const linkEl = c.matches('a') ? c : c.querySelector('a');
+            return {
+                name: nameEl ? (nameEl.innerText.trim() || nameEl.getAttribute('alt') || nameEl.getAttribute('title') || '') : '',
+                price: priceEl ? priceEl.innerText.trim() : '',
+                url: linkEl ? (linkEl.href || '') : ''
+            };
+        }).filter(row => nameRe.test(row.name)).slice(0, maxMatches);
+    """
+    
+    def __init__(self, pool_size: int = 2):
+        # fetch_mode picks the cheapest path that works for each store:
+        #   json     - Shopify products.json, no HTML parsing or browser
+        #   html     - plain HTTP + BeautifulSoup, browser only if a bot challenge is served
+        #   selenium - always render in the stealth browser
         self.stores = {
+            'cardmerchant_nz': {
+                'name': 'Card Merchant NZ',
+                'base_url': 'https://cardmerchant.co.nz',
+                'json_url': 'https://cardmerchant.co.nz/collections/pokemon-sealed/products.json?limit=250',
+                'json_products_path': 'products',
+                'search_url': 'https://cardmerchant.co.nz/search?q=phantasmal+flames&type=product',
+                'backup_url': 'https://cardmerchant.co.nz/collections/pokemon-sealed',
+                'product_selector': '.product-card, .grid-product',
+                'name_selector': '.product-card__title, .grid-product__title',
+                'price_selector': '.price, .money',
+                'protection': 'none',
+                'fetch_mode': 'json'
+            },
             'jbhifi_nz': {
                 'name': 'JB Hi-Fi NZ',
                 'search_url': 'https://www.jbhifi.co.nz/search?query=phantasmal+flames+pokemon',
@@ -30,7 +178,8 @@ class AdvancedPhantasmalSearcher:
                 'product_selector': '.product-item',
                 'name_selector': '.product-title a, h3 a',
                 'price_selector': '.price, .product-price',
-                'protection': 'light'
+                'protection': 'light',
+                'fetch_mode': 'html'
             },
             'ebgames_nz': {
                 'name': 'EB Games NZ',
@@ -39,7 +188,8 @@ class AdvancedPhantasmalSearcher:
                 'product_selector': '.product-item, [class*="product"]',
                 'name_selector': 'h3 a, h2 a, .product-name a',
                 'price_selector': '.price, .product-price',
-                'protection': 'cloudflare'
+                'protection': 'cloudflare',
+                'fetch_mode': 'html'
             },
             'pbtech_nz': {
                 'name': 'PB Tech NZ',
@@ -48,7 +198,8 @@ class AdvancedPhantasmalSearcher:
                 'product_selector': 'a[data-product-code], .product-link',
                 'name_selector': 'img[alt], [title]',
                 'price_selector': '[data-price], .price',
-                'protection': 'cloudflare'
+                'protection': 'cloudflare',
+                'fetch_mode': 'html'
             },
             'mightyape_nz': {
                 'name': 'Mighty Ape NZ',
@@ -57,108 +208,233 @@ class AdvancedPhantasmalSearcher:
                 'product_selector': '.product, [class*="product"]',
                 'name_selector': '.product-name, h3 a',
                 'price_selector': '.price, .product-price',
-                'protection': 'captcha'
+                'protection': 'captcha',
+                'fetch_mode': 'html'
             }
         }
+        self.pool = DriverPool(self.get_stealth_driver, size=pool_size)
+        self.session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self):
+        self.create_session_if_needed()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def create_session_if_needed(self):
+        """Create the shared HTTP session so every store search reuses warm connections"""
+        if not self.session or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=4,      # Stay polite to each store
+                keepalive_timeout=30,  # Reuse TLS connections between searches
+                ttl_dns_cache=300      # DNS cache TTL (5 minutes)
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+    
+    async def close(self):
+        """Close the shared HTTP session and shut down any warm browser instances"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        await self.pool.close()
     
     def get_stealth_driver(self) -> webdriver.Chrome:
         """Create a stealthy Chrome driver to bypass bot detection"""
         options = Options()
         
-        # Stealth options to avoid detection
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-blink-features=AutomationControlled')
+        # Stealth and resource-blocking flags are shared by every driver
+        for argument in _CHROME_ARGS:
+            options.add_argument(argument)
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        options.add_experimental_option("prefs", _CHROME_PREFS)
         
         # Random user agent rotation
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
-        ]
-        options.add_argument(f'--user-agent={random.choice(user_agents)}')
+        options.add_argument(f'--user-agent={random.choice(USER_AGENTS)}')
         
         # Window size randomization
         options.add_argument(f'--window-size={random.randint(1200, 1920)},{random.randint(800, 1080)}')
         
         driver = webdriver.Chrome(options=options)
         
-        # Execute script to remove webdriver property
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Register the fingerprint overrides before any page script can run, on every new document
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _STEALTH_JS})
         
         return driver
 
-    def wait_and_retry(self, min_wait=2, max_wait=5):
+    async def wait_and_retry(self, min_wait=2, max_wait=5):
         """Random wait to appear more human-like"""
         wait_time = random.uniform(min_wait, max_wait)
-        time.sleep(wait_time)
+        await asyncio.sleep(wait_time)
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str) -> Tuple[int, Dict[str, str], str]:
+        """Fetch a search page over plain HTTP, returning (status, headers, body)"""
+        headers = {
+            'User-Agent': random.choice(USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-NZ,en;q=0.9',
+        }
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
+            return response.status, dict(response.headers), await response.text()
 
+    def is_bot_challenge(self, status: int, headers: Dict[str, str], html: str) -> bool:
+        """Check if an HTTP response is a JS challenge that needs a real browser"""
+        if "Just a moment" in html or "captcha-delivery" in html:
+            return True
+        return status == 403 and 'cf-ray' in {key.lower() for key in headers}
+
+    @async_memoize(ttl=600, key=lambda self, store_key: store_key)
     async def search_store(self, store_key: str) -> List[Dict[str, Any]]:
-        """Search a specific store for Phantasmal Flames"""
+        """Search a specific store for Phantasmal Flames (results cached for 10 minutes)"""
         store_config = self.stores[store_key]
         products = []
         
-        print(f"\n🔍 Searching {store_config['name']} for Phantasmal Flames...")
+        # Jitter the first request per store so concurrent searches don't fire in lockstep
+        await asyncio.sleep(random.uniform(0, 3))
+        
+        logger.info(f"🔍 Searching {store_config['name']} for Phantasmal Flames...")
         
-        driver = self.get_stealth_driver()
+        self.create_session_if_needed()
+        fetch_mode = store_config.get('fetch_mode', 'html')
+        
+        if fetch_mode == 'json':
+            json_products = await self._search_json(store_config)
+            if json_products is not None:
+                return json_products
+            logger.warning(f"⚠️ JSON endpoint unavailable, falling back to HTML...")
+        elif fetch_mode == 'selenium':
+            return await self.search_store_selenium(store_config)
         
         try:
             # Try main search URL first
             for attempt, url in enumerate([store_config['search_url'], store_config['backup_url']], 1):
-                print(f"   Attempt {attempt}: {url}")
+                logger.info(f"Attempt {attempt}: {url}")
                 
-                driver.get(url)
-                self.wait_and_retry(3, 8)  # Wait for page load
+                status, headers, html = await self._fetch(self.session, url)
                 
-                # Handle different protection types
-                if store_config['protection'] == 'cloudflare':
-                    if await self.handle_cloudflare(driver):
-                        print(f"   ✅ Bypassed Cloudflare protection!")
-                    else:
-                        print(f"   ❌ Cloudflare protection active, trying alternative...")
-                        continue
+                if self.is_bot_challenge(status, headers, html):
+                    # Only pay for a full browser when the store serves a JS challenge
+                    logger.info(f"🛡️ Bot challenge detected, falling back to browser...")
+                    return await self.search_store_selenium(store_config)
                 
-                elif store_config['protection'] == 'captcha':
-                    if await self.handle_captcha(driver):
-                        print(f"   ✅ Bypassed captcha protection!")
-                    else:
-                        print(f"   ❌ Captcha protection active, trying alternative...")
-                        continue
+                if status != 200:
+                    logger.warning(f"⚠️ HTTP {status}, trying backup URL...")
+                    continue
                 
                 # Look for products
-                products = await self.extract_products(driver, store_config)
+                products = self.extract_products(html, store_config)
                 if products:
-                    print(f"   ✅ Found {len(products)} products!")
+                    logger.info(f"✅ Found {len(products)} products at {store_config['name']}!")
                     break
                 else:
-                    print(f"   ⚠️ No products found, trying backup URL...")
+                    logger.warning(f"⚠️ No products found, trying backup URL...")
             
             return products
             
         except Exception as e:
-            print(f"   ❌ Error searching {store_config['name']}: {e}")
+            logger.error(f"❌ Error searching {store_config['name']}: {e}")
+            return []
+
+    async def _search_json(self, store_config: Dict[str, Any], max_matches: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Search a Shopify-style products.json feed, returning None if the endpoint is unusable"""
+        url = store_config['json_url']
+        logger.info(f"JSON attempt: {url}")
+        
+        try:
+            headers = {'User-Agent': random.choice(USER_AGENTS), 'Accept': 'application/json'}
+            async with self.session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                if response.status != 200 or 'json' not in response.content_type:
+                    return None
+                data = jsonio.loads(await response.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning(f"⚠️ JSON fetch failed for {store_config['name']}: {e}")
+            return None
+        
+        items = data
+        for key in store_config['json_products_path'].split('.'):
+            items = items.get(key, []) if isinstance(items, dict) else []
+        
+        products = []
+        for item in items:
+            name = item.get('title', '')
+            if not name or not self._NAME_RE.search(name):
+                continue
+            
+            variants = item.get('variants') or [{}]
+            price = variants[0].get('price')
+            
+            products.append({
+                'name': name,
+                'price': f"${price}" if price else 'Not available',
+                'url': f"{store_config['base_url']}/products/{item.get('handle', '')}",
+                'store': store_config['name']
+            })
+            logger.info(f"✅ {name} - {products[-1]['price']}")
+            
+            if len(products) >= max_matches:
+                break
+        
+        logger.info(f"✅ Found {len(products)} products at {store_config['name']}!")
+        return products
+
+    async def search_store_selenium(self, store_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Search a store with a stealth browser (fallback for JS-challenge protected stores)"""
+        products = []
+        
+        try:
+            async with self.pool.lease() as driver:
+                for attempt, url in enumerate([store_config['search_url'], store_config['backup_url']], 1):
+                    logger.info(f"Browser attempt {attempt}: {url}")
+                    
+                    await asyncio.to_thread(driver.get, url)
+                    await self.wait_and_retry(3, 8)  # Wait for page load
+                    
+                    # Handle different protection types
+                    if store_config['protection'] == 'cloudflare':
+                        if await self.handle_cloudflare(driver):
+                            logger.info(f"✅ Bypassed Cloudflare protection!")
+                        else:
+                            logger.warning(f"❌ Cloudflare protection active, trying alternative...")
+                            continue
+                    
+                    elif store_config['protection'] == 'captcha':
+                        if await self.handle_captcha(driver):
+                            logger.info(f"✅ Bypassed captcha protection!")
+                        else:
+                            logger.warning(f"❌ Captcha protection active, trying alternative...")
+                            continue
+                    
+                    # Look for products
+                    products = await self.extract_products_from_driver(driver, store_config)
+                    if products:
+                        logger.info(f"✅ Found {len(products)} products at {store_config['name']}!")
+                        break
+                    else:
+                        logger.warning(f"⚠️ No products found, trying backup URL...")
+            
+            return products
+            
+        except Exception as e:
+            logger.error(f"❌ Error searching {store_config['name']}: {e}")
             return []
-        finally:
-            driver.quit()
 
     async def handle_cloudflare(self, driver) -> bool:
         """Attempt to bypass Cloudflare protection"""
         try:
-            # Check if we're on a Cloudflare challenge page
-            if "Just a moment" in driver.page_source or "cloudflare" in driver.page_source.lower():
-                print(f"   🔄 Cloudflare challenge detected, waiting...")
+            # Ask the page for a boolean instead of serialising the whole DOM over the driver
+            if await asyncio.to_thread(driver.execute_script, self._CF_CHALLENGE_JS):
+                logger.info(f"🔄 Cloudflare challenge detected, waiting...")
                 
-                # Wait up to 30 seconds for challenge to complete
-                for i in range(30):
-                    time.sleep(1)
-                    if "Just a moment" not in driver.page_source:
-                        return True
-                    if i % 5 == 0:
-                        print(f"   ⏳ Still waiting... ({i+1}s)")
-                
-                return False
+                # Wait up to 30 seconds, returning as soon as the challenge clears
+                try:
+                    await asyncio.to_thread(
+                        WebDriverWait(driver, 30, poll_frequency=0.25).until,
+                        lambda d: not d.execute_script(self._CF_CHALLENGE_JS)
+                    )
+                    return True
+                except TimeoutException:
+                    return False
             return True
         except Exception:
             return False
@@ -166,129 +442,193 @@ class AdvancedPhantasmalSearcher:
     async def handle_captcha(self, driver) -> bool:
         """Attempt to handle captcha systems"""
         try:
-            if "captcha-delivery" in driver.page_source:
-                print(f"   🔄 Captcha system detected...")
+            page_source = await asyncio.to_thread(lambda: driver.page_source)
+            if "captcha-delivery" in page_source:
+                logger.info(f"🔄 Captcha system detected...")
                 # For now, just wait and see if it auto-resolves
-                time.sleep(10)
-                return "captcha-delivery" not in driver.page_source
+                await asyncio.sleep(10)
+                page_source = await asyncio.to_thread(lambda: driver.page_source)
+                return "captcha-delivery" not in page_source
             return True
         except Exception:
             return False
 
-    async def extract_products(self, driver, store_config) -> List[Dict[str, Any]]:
-        """Extract product information from the page"""
+    def _build_url(self, href: Optional[str], store_config: Dict[str, Any]) -> str:
+        """Make a product link absolute"""
+        if not href:
+            return 'Not available'
+        return href if href.startswith('http') else f"https://{store_config['name'].lower().split()[0]}.co.nz{href}"
+
+    def extract_products(self, html: str, store_config: Dict[str, Any], max_matches: int = 10) -> List[Dict[str, Any]]:
+        """Extract product information from raw search page HTML, stopping after max_matches hits"""
         products = []
         
         try:
-            # Scroll to load dynamic content
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-            self.wait_and_retry(2, 4)
-            
-            # Find product containers
-            containers = driver.find_elements(By.CSS_SELECTOR, store_config['product_selector'])
-            print(f"   📦 Found {len(containers)} potential product containers")
+            page = BeautifulSoup(html, 'html.parser')
+            containers = page.select(store_config['product_selector'])
+            logger.info(f"📦 Found {len(containers)} potential product containers")
             
             for container in containers[:20]:  # Limit to first 20 for performance
-                try:
-                    # Extract product name
-                    name_elem = container.find_element(By.CSS_SELECTOR, store_config['name_selector'])
-                    name = name_elem.text.strip() or name_elem.get_attribute('alt') or name_elem.get_attribute('title')
-                    
-                    if not name:
-                        continue
-                    
-                    # Check if it's Phantasmal Flames related
-                    name_lower = name.lower()
-                    if not any(term in name_lower for term in ['phantasmal', 'phantom', 'flames']):
-                        continue
-                    
-                    # Extract price
-                    price = 'Not available'
-                    try:
-                        price_elem = container.find_element(By.CSS_SELECTOR, store_config['price_selector'])
-                        price_text = price_elem.text.strip()
-                        if price_text and '$' in price_text:
-                            price = price_text
-                    except NoSuchElementException:
-                        pass
-                    
-                    # Extract URL
-                    url = 'Not available'
-                    try:
-                        link_elem = container.find_element(By.CSS_SELECTOR, 'a')
-                        href = link_elem.get_attribute('href')
-                        if href:
-                            url = href if href.startswith('http') else f"https://{store_config['name'].lower().split()[0]}.co.nz{href}"
-                    except NoSuchElementException:
-                        pass
-                    
-                    product = {
-                        'name': name,
-                        'price': price,
-                        'url': url,
-                        'store': store_config['name']
-                    }
-                    
-                    products.append(product)
-                    print(f"      ✅ {name} - {price}")
-                    
-                except Exception as e:
+                # Extract product name
+                name_elem = container.select_one(store_config['name_selector'])
+                if not name_elem:
+                    continue
+                name = name_elem.get_text(strip=True) or name_elem.get('alt') or name_elem.get('title')
+                
+                if not name:
                     continue
+                
+                # Check if it's Phantasmal Flames related
+                if not self._NAME_RE.search(name):
+                    continue
+                
+                # Extract price
+                price = 'Not available'
+                price_elem = container.select_one(store_config['price_selector'])
+                if price_elem:
+                    price_text = price_elem.get_text(strip=True)
+                    if price_text and '$' in price_text:
+                        price = price_text
+                
+                # Extract URL
+                link_elem = container if container.name == 'a' else container.select_one('a')
+                url = self._build_url(link_elem.get('href') if link_elem else None, store_config)
+                
+                products.append({
+                    'name': name,
+                    'price': price,
+                    'url': url,
+                    'store': store_config['name']
+                })
+                logger.info(f"✅ {name} - {price}")
+                
+                if len(products) >= max_matches:
+                    break
             
         except Exception as e:
-            print(f"   ❌ Error extracting products: {e}")
+            logger.error(f"❌ Error extracting products: {e}")
         
         return products
 
-async def search_all_stores_for_phantasmal():
+    async def extract_products_from_driver(self, driver, store_config, max_matches: int = 10) -> List[Dict[str, Any]]:
+        """Extract product information from a page rendered in the browser"""
+        try:
+            # Scroll to load dynamic content
+            await asyncio.to_thread(driver.execute_script, "window.scrollTo(0, document.body.scrollHeight/2);")
+            await self.wait_and_retry(2, 4)
+        except Exception as e:
+            logger.error(f"❌ Error extracting products: {e}")
+            return []
+        
+        # WebDriver calls block, so run the extraction loop off the event loop
+        return await asyncio.to_thread(self._extract_from_driver_page, driver, store_config, max_matches)
+
+    def _extract_from_driver_page(self, driver, store_config, max_matches: int = 10) -> List[Dict[str, Any]]:
+        """Pull every product container's fields in one WebDriver call, then filter locally"""
+        products = []
+        
+        try:
+            rows = driver.execute_script(
+                self._EXTRACT_JS,
+                store_config['product_selector'],
+                store_config['name_selector'],
+                store_config['price_selector'],
+                20,  # Limit to first 20 for performance
+                self._NAME_RE.pattern,
+                max_matches
+            )
+            logger.info(f"📦 Found {len(rows)} matching product containers")
+            
+            for row in rows:
+                name = row['name']
+                
+                # Check if it's Phantasmal Flames related
+                if not name or not self._NAME_RE.search(name):
+                    continue
+                
+                price_text = row['price']
+                price = price_text if price_text and '$' in price_text else 'Not available'
+                url = self._build_url(row['url'], store_config)
+                
+                product = {
+                    'name': name,
+                    'price': price,
+                    'url': url,
+                    'store': store_config['name']
+                }
+                
+                products.append(product)
+                logger.info(f"✅ {name} - {price}")
+            
+        except Exception as e:
+            logger.error(f"❌ Error extracting products: {e}")
+        
+        return products
+
+async def _bounded(sem: asyncio.Semaphore, coro):
+    """Await a coroutine while holding a slot in the semaphore"""
+    async with sem:
+        return await coro
+
+async def search_all_stores_for_phantasmal(max_concurrent: int = 4):
     """Main function to search all stores for Phantasmal Flames"""
     
-    print("🔥 PHANTASMAL FLAMES SEARCH ACROSS ALL NZ STORES")
-    print("=" * 60)
-    print("Searching for the new Pokemon TCG set across all available retailers...")
-    print()
+    logger.info("🔥 PHANTASMAL FLAMES SEARCH ACROSS ALL NZ STORES")
+    logger.info("=" * 60)
+    logger.info("Searching for the new Pokemon TCG set across all available retailers...")
     
-    searcher = AdvancedPhantasmalSearcher()
     all_products = []
     
-    # Search each store
-    for store_key in searcher.stores.keys():
-        products = await searcher.search_store(store_key)
-        all_products.extend(products)
-        
-        # Wait between stores to avoid triggering more protections
-        await asyncio.sleep(random.uniform(2, 5))
+    async with AdvancedPhantasmalSearcher() as searcher:
+        # Search all stores concurrently, bounded so we never hammer too many at once
+        sem = asyncio.Semaphore(max_concurrent)
+        results = await asyncio.gather(
+            *[_bounded(sem, searcher.search_store(store_key)) for store_key in searcher.stores],
+            return_exceptions=True
+        )
+    
+    for store_key, result in zip(searcher.stores, results):
+        if isinstance(result, Exception):
+            logger.error(f"❌ Error searching {searcher.stores[store_key]['name']}: {result}")
+            continue
+        all_products.extend(result)
     
     # Generate comprehensive report
-    print("\n" + "=" * 60)
-    print("🎯 PHANTASMAL FLAMES COMPREHENSIVE REPORT")
-    print("=" * 60)
+    logger.info("=" * 60)
+    logger.info("🎯 PHANTASMAL FLAMES COMPREHENSIVE REPORT")
+    logger.info("=" * 60)
     
     if all_products:
-        print(f"📊 Total products found: {len(all_products)}")
-        print(f"🏪 Stores with stock: {len(set(p['store'] for p in all_products))}")
+        logger.info(f"📊 Total products found: {len(all_products)}")
+        logger.info(f"🏪 Stores with stock: {len(set(p['store'] for p in all_products))}")
         
-        print("\n📦 ALL PHANTASMAL FLAMES PRODUCTS:")
+        logger.info("📦 ALL PHANTASMAL FLAMES PRODUCTS:")
         for i, product in enumerate(all_products, 1):
-            print(f"{i:2d}. {product['name']}")
-            print(f"     🏪 Store: {product['store']}")
-            print(f"     💰 Price: {product['price']}")
-            print(f"     🔗 URL: {product['url']}")
-            print()
+            logger.info(f"{i:2d}. {product['name']} | 🏪 {product['store']} | 💰 {product['price']} | 🔗 {product['url']}")
         
         # Price analysis
-        prices = [p['price'] for p in all_products if '$' in p['price']]
-        if prices:
-            print("💰 PRICE ANALYSIS:")
-            print(f"   Cheapest: {min(prices, key=lambda x: float(x.replace('$', '').replace(',', '')))} ")
-            print(f"   Most expensive: {max(prices, key=lambda x: float(x.replace('$', '').replace(',', '')))}")
+        # Parse each price once and compare the (value, text) pairs
+        parsed = [
+            (value, p['price'])
+            for p in all_products if '$' in p['price']
+            for value in (format_price(p['price']),) if value is not None
+        ]
+        if parsed:
+            logger.info("💰 PRICE ANALYSIS:")
+            logger.info(f"Cheapest: {min(parsed)[1]}")
+            logger.info(f"Most expensive: {max(parsed)[1]}")
     else:
-        print("❌ No Phantasmal Flames products found in any NZ store")
-        print("\n🔍 This could mean:")
-        print("   • Set hasn't been released in NZ yet")
-        print("   • All stock is sold out")
-        print("   • Different product naming is used")
-        print("   • Bot protections blocked access to product data")
+        logger.warning("❌ No Phantasmal Flames products found in any NZ store")
+        logger.info("🔍 This could mean:")
+        logger.info("• Set hasn't been released in NZ yet")
+        logger.info("• All stock is sold out")
+        logger.info("• Different product naming is used")
+        logger.info("• Bot protections blocked access to product data")
 
 if __name__ == '__main__':
-    asyncio.run(search_all_stores_for_phantasmal())
\ No newline at end of file
+    # Log records are written by a background thread so concurrent store searches never block on stdout
+    listener = start_queue_logging()
+    try:
+        asyncio.run(search_all_stores_for_phantasmal())
+    finally:
+        listener.stop()
@@ -3,7 +3,13 @@ from discord.ext import commands
 from typing import Optional
 import logging
 
-from utils.helpers import clean_sku
+from utils.helpers import clean_sku, format_product_list
+
+_BOT_INFO_STORES = "Pokemon Center\nTCGPlayer\nBest Buy\nGameStop"
+_BOT_INFO_COMMANDS = (
+    "`!add_sku` - Add SKU to monitor\n`!remove_sku` - Remove SKU\n"
+    "`!list_skus` - List all SKUs\n`!check_now` - Force check"
+)
 
 async def handle_add_sku(bot, ctx, sku: str, store: str, product_name: Optional[str] = None):
     """Handle adding a SKU to monitor"""
@@ -60,23 +66,23 @@ async def handle_remove_sku(bot, ctx, sku: str, store: Optional[str] = None):
 async def handle_list_skus(bot, ctx):
     """Handle listing all monitored SKUs"""
     try:
-        products = await bot.db_manager.get_all_products()
+        # Grouping and the 10-per-store cap are done by the database query
+        stores = await bot.db_manager.get_products_grouped(limit_per_store=10)
         
-        if not products:
+        if not stores:
             await ctx.send("📭 No SKUs are currently being monitored.")
             return
         
+        total_products = sum(store_products[0]['store_total'] for store_products in stores.values())
+        
         embed = discord.Embed(
             title="📋 Monitored SKUs",
-            description=f"Currently monitoring {len(products)} products",
+            description=f"Currently monitoring {total_products} products",
             color=bot.config.embed_color
         )
         
-        # Group by store
-        stores = _group_products_by_store(products)
-        
         for store, store_products in stores.items():
-            product_list = _format_product_list(store_products)
+            product_list = format_product_list(store_products)
             
             embed.add_field(
                 name=f"🏪 {store.title()}",
@@ -90,31 +96,6 @@ async def handle_list_skus(bot, ctx):
         logging.error(f"Error in list_skus command: {e}")
         await ctx.send("❌ An error occurred while fetching SKUs.")
 
-def _group_products_by_store(products):
-    """Group products by store name"""
-    stores = {}
-    for product in products:
-        store = product['store_name']
-        if store not in stores:
-            stores[store] = []
-        stores[store].append(product)
-    return stores
-
-def _format_product_list(store_products):
-    """Format product list for display"""
-    product_list = []
-    for product in store_products[:10]:  # Limit to 10 per store
-        status_emoji = "🟢" if product['current_stock_status'] == 'In Stock' else "🔴"
-        product_info = f"{status_emoji} {product['sku']}"
-        if product['product_name']:
-            product_info += f" - {product['product_name'][:30]}..."
-        product_list.append(product_info)
-    
-    if len(store_products) > 10:
-        product_list.append(f"... and {len(store_products) - 10} more")
-    
-    return product_list
-
 async def handle_check_now(bot, ctx):
     """Handle immediate stock check"""
     try:
@@ -126,15 +107,21 @@ async def handle_check_now(bot, ctx):
             await ctx.send("📭 No products to check.")
             return
         
-        stock_changes = await bot.monitor_manager.check_all_products(products)
+        stock_changes, failures = await bot.monitor_manager.check_products(products)
         
         if stock_changes:
             await bot.notification_manager.send_stock_notifications(stock_changes)
+        
+        description = f"Checked {len(products)} products\nFound {len(stock_changes)} changes"
+        if failures:
+            description += f"\n⚠️ {len(failures)} checks failed: " + ", ".join(
+                product['sku'] for product, _ in failures[:10]
+            )
             
         embed = discord.Embed(
-            title="✅ Stock Check Complete",
-            description=f"Checked {len(products)} products\nFound {len(stock_changes)} changes",
-            color=0x00ff00
+            title="✅ Stock Check Complete" if not failures else "⚠️ Stock Check Partially Complete",
+            description=description,
+            color=0x00ff00 if not failures else 0xffa500
         )
         
         await ctx.send(embed=embed)
@@ -143,8 +130,24 @@ async def handle_check_now(bot, ctx):
         logging.error(f"Error in check_now command: {e}")
         await ctx.send("❌ An error occurred during the stock check.")
 
+def _build_bot_info_template(config) -> discord.Embed:
+    """Build the parts of the !bot_info embed that never change between calls"""
+    embed = discord.Embed(
+        title="🤖 Pokemon Stock Bot Info",
+        description="Real-time Pokemon product stock monitoring",
+        color=config.embed_color
+    )
+    
+    # Field 0 is filled in per call with the live product count
+    embed.add_field(name="Monitored Products", value="0", inline=True)
+    embed.add_field(name="Check Interval", value=f"{config.check_interval}s", inline=True)
+    embed.add_field(name="Supported Stores", value=_BOT_INFO_STORES, inline=True)
+    embed.add_field(name="Commands", value=_BOT_INFO_COMMANDS, inline=False)
+    return embed
+
 def setup_commands(bot):
     """Setup all bot commands"""
+    bot_info_template = _build_bot_info_template(bot.config)
     
     @bot.command(name='add_sku')
     async def add_sku(ctx, sku: str, store: str, *, product_name: Optional[str] = None):
@@ -216,23 +219,11 @@ def setup_commands(bot):
         Usage: !bot_info
         """
         try:
-            products = await bot.db_manager.get_all_products()
-            
-            embed = discord.Embed(
-                title="🤖 Pokemon Stock Bot Info",
-                description="Real-time Pokemon product stock monitoring",
-                color=bot.config.embed_color
-            )
-            
-            embed.add_field(name="Monitored Products", value=len(products), inline=True)
-            embed.add_field(name="Check Interval", value=f"{bot.config.check_interval}s", inline=True)
-            embed.add_field(name="Supported Stores", value="Pokemon Center\nTCGPlayer\nBest Buy\nGameStop", inline=True)
+            # COUNT(*) cached by the database manager until the next product write
+            product_count = await bot.db_manager.count_products()
             
-            embed.add_field(
-                name="Commands",
-                value="`!add_sku` - Add SKU to monitor\n`!remove_sku` - Remove SKU\n`!list_skus` - List all SKUs\n`!check_now` - Force check",
-                inline=False
-            )
+            embed = bot_info_template.copy()
+            embed.set_field_at(0, name="Monitored Products", value=product_count, inline=True)
             
             await ctx.send(embed=embed)
             
@@ -5,25 +5,139 @@ Provides comprehensive daily stock summaries and scanning functionality
 """
 import asyncio
 import aiohttp
-import sqlite3
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+import random
+import time
+import functools
+import aiosqlite
+from itertools import islice
+from urllib.parse import urlparse
+from datetime import datetime, time as dt_time, timedelta, timezone
+from typing import Callable, Dict, List, Set, Tuple, Optional
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    ZoneInfo = None
 import discord
 from discord.ext import commands
-from monitors.generic_monitor import GenericStoreMonitor
-from database.manager import DatabaseManager
+from monitors.generic_monitor import GenericStoreMonitor, run_on_selenium_thread
+from database.models import ScannedProduct
+from utils.cache import TTLCache
+from utils.rate_limiter import RateLimiter
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Sent with every store request from the shared scan session
+COMMON_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Bound every store request so one hung site can't stall the whole scan
+TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+FETCH_ATTEMPTS = 3
+
+# Requests per second allowed to each store host; stores can override with requests_per_second
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+
+# At most this many stores are scanned at once, so bot-detecting sites aren't hit in a burst
+MAX_CONCURRENT_SCANS = 4
+
+# Sightings listed under "Recent Community Reports" in /stock_summary
+RECENT_SIGHTINGS_LIMIT = 3
+
+# Fuller browser headers for stores with bot detection (EB Games HTTP fallback)
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Report times are shown in NZ time; fall back to the host's local zone when tz data is unavailable
+try:
+    REPORT_TZ = ZoneInfo('Pacific/Auckland') if ZoneInfo else None
+except KeyError:  # ZoneInfoNotFoundError, e.g. Windows without the tzdata package
+    REPORT_TZ = None
+
+# One token bucket per store host, shared by every scan (and every retry) that hits it
+_host_limiters: Dict[str, RateLimiter] = {}
+
+def _host_limiter(url: str) -> RateLimiter:
+    """The rate limiter for url's host, created at the default rate the first time it's seen"""
+    host = urlparse(url).netloc
+    limiter = _host_limiters.get(host)
+    if limiter is None:
+        limiter = _host_limiters[host] = RateLimiter(DEFAULT_REQUESTS_PER_SECOND)
+    return limiter
+
+# Hosts that answered 403 to the plain HTTP fallback; skipped until the entry expires
+_blocked_hosts = TTLCache(maxsize=32, ttl=6 * 3600)
+
+_STATUS_EMOJI = {'success': '✅', 'error': '❌', 'skipped': '⏭️'}
+
+def _price_text(product: ScannedProduct, fallback: str) -> str:
+    """Format a product price for the report, or the fallback when it's unknown"""
+    price = product.price
+    return f"${price:.2f}" if price and price > 0 else fallback
+
+def _short_name(product: ScannedProduct, limit: int) -> str:
+    """Product name clipped to limit characters so embed lines stay readable"""
+    product_name = product.name
+    return product_name if len(product_name) <= limit else product_name[:limit - 3] + "..."
+
+# One pooled HTTP session for every daily scan, so keep-alive connections and DNS
+# lookups survive between stores and between scans
+_session: Optional[aiohttp.ClientSession] = None
+
+def _shared_session() -> aiohttp.ClientSession:
+    """The shared scan session, created on first use so it binds to the running loop"""
+    global _session
+    if _session is None or _session.closed:
+        # Per-host cap so one slow site can't hold every connection
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=2, ttl_dns_cache=300, keepalive_timeout=30)
+        _session = aiohttp.ClientSession(connector=connector, headers=COMMON_HEADERS)
+    return _session
+
+async def close_session():
+    """Close the shared scan session; call from the bot's shutdown hook"""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
 class DailyStockReporter:
     """Handles daily stock reporting and scanning operations"""
     
+    _INSERT_SCAN_SQL = '''
+        INSERT INTO daily_scans (scan_date, scan_time, stores_scanned, products_found, new_arrivals, errors, summary)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+    
     def __init__(self, bot):
         self.bot = bot
         self.monitor = GenericStoreMonitor(bot.config)
-        self.db_manager = DatabaseManager()
+        # The bot's manager, so scans read and write the configured database
+        self.db_manager = bot.db_manager
+        self.reload_configs()
+        
+        # Store id -> scan coroutine; stores without an entry are reported as skipped
+        fetch = self._fetch_and_parse
+        self._handlers = {
+            'novagames_nz': functools.partial(fetch, parser=self.monitor.parse_nova_games_products),  # Nova Games - we know this works perfectly
+            'cardmerchant_nz': functools.partial(fetch, parser=self.monitor.parse_cardmerchant_products),  # Card Merchant - JSON API
+            'ebgames_nz': self._scan_ebgames,  # EB Games - Selenium with HTTP fallback
+        }
+    
+    def reload_configs(self):
+        """(Re)load store configs and cache the NZ subset used by every scan"""
+        store_configs = self.monitor.load_store_configs()
         
+        # Filter to only NZ stores (those ending with '_nz')
+        self._nz_stores = {k: v for k, v in store_configs.items() if k.endswith('_nz')}
+    
     async def perform_daily_scan(self, report_channel_id: int = None) -> Dict:
         """
         Performs a comprehensive daily scan of all NZ stores
@@ -31,8 +145,12 @@ class DailyStockReporter:
         """
         logger.info("Starting daily stock scan...")
         
+        now_utc = datetime.now(timezone.utc)
+        local_now = now_utc.astimezone(REPORT_TZ)
         scan_results = {
-            'timestamp': datetime.now(),
+            'timestamp': now_utc,
+            'scan_date': local_now.date(),
+            'timestamp_str': local_now.strftime('%I:%M %p'),
             'stores_scanned': [],
             'products_found': [],
             'errors': [],
@@ -40,43 +158,63 @@ class DailyStockReporter:
             'stock_changes': []
         }
         
-        # Get all NZ stores from config
-        store_configs = self.monitor.load_store_configs()
+        nz_stores = self._nz_stores
         
-        # Filter to only NZ stores (those ending with '_nz')
-        nz_stores = {k: v for k, v in store_configs.items() if k.endswith('_nz')}
+        # Register each store's request rate before any of its requests go out
+        for config in nz_stores.values():
+            _host_limiter(config['search_url']).rate = config.get('requests_per_second', DEFAULT_REQUESTS_PER_SECOND)
         
         logger.info(f"Found {len(nz_stores)} NZ stores to scan: {list(nz_stores.keys())}")
         
-        for store_id, config in nz_stores.items():
-            try:
-                logger.info(f"Scanning {config['name']}...")
-                
-                # Perform store scan
-                store_results = await self._scan_store(store_id, config)
-                scan_results['stores_scanned'].append({
-                    'store_id': store_id,
-                    'store_name': config['name'],
-                    'status': store_results['status'],
-                    'products_found': len(store_results.get('products', [])),
-                    'error': store_results.get('error')
-                })
-                
-                # Add products to results
-                if store_results.get('products'):
-                    for product in store_results['products']:
-                        product['store_id'] = store_id
-                        product['store_name'] = config['name']
-                        scan_results['products_found'].append(product)
-                        
-                        # Check if this is a new arrival BEFORE we save it to database
-                        if await self._is_new_arrival(product):
-                            scan_results['new_arrivals'].append(product)
-                
-            except Exception as e:
-                error_msg = f"Error scanning {config['name']}: {str(e)}"
+        # Scan stores concurrently (bounded by a semaphore); total time is roughly the slowest store
+        session = _shared_session()
+        scan_sem = asyncio.Semaphore(MAX_CONCURRENT_SCANS)
+        
+        async def bounded_scan(store_id: str, config: Dict) -> Dict:
+            async with scan_sem:
+                return await self._scan_store(store_id, config, session)
+        
+        # The snapshot of tracked SKUs (so new arrivals are a set lookup, not a query per
+        # product) is read while the stores are being fetched; get_all_skus never raises
+        existing_skus, *results = await asyncio.gather(
+            self.db_manager.get_all_skus([config['name'] for config in nz_stores.values()]),
+            *[bounded_scan(store_id, config) for store_id, config in nz_stores.items()],
+            return_exceptions=True
+        )
+        
+        for (store_id, config), store_results in zip(nz_stores.items(), results):
+            if isinstance(store_results, Exception):
+                error_msg = f"Error scanning {config['name']}: {str(store_results)}"
                 logger.error(error_msg)
                 scan_results['errors'].append(error_msg)
+                continue
+            
+            scan_results['stores_scanned'].append({
+                'store_id': store_id,
+                'store_name': config['name'],
+                'status': store_results['status'],
+                'products_found': len(store_results.get('products', [])),
+                'error': store_results.get('error')
+            })
+            
+            # Add products to results
+            scan_results['products_found'].extend(
+                ScannedProduct(
+                    store_id=store_id,
+                    store_name=config['name'],
+                    name=product.get('name') or 'Unknown Product',
+                    url=product.get('url', ''),
+                    sku=product.get('sku', ''),
+                    price=product.get('price')
+                )
+                for product in store_results.get('products') or []
+            )
+        
+        # Check for new arrivals BEFORE we save anything to the database
+        scan_results['new_arrivals'] = [
+            product for product in scan_results['products_found']
+            if self._is_new_arrival(product, existing_skus)
+        ]
         
         # Save scan results to database
         await self._save_scan_results(scan_results)
@@ -88,269 +226,164 @@ class DailyStockReporter:
         logger.info(f"Daily scan complete. Found {len(scan_results['products_found'])} products across {len(scan_results['stores_scanned'])} stores")
         return scan_results
     
-    async def _scan_store(self, store_id: str, config: Dict) -> Dict:
+    async def _scan_store(self, store_id: str, config: Dict, session: aiohttp.ClientSession) -> Dict:
         """Scan a single store for Pokemon products"""
+        handler = self._handlers.get(store_id)
+        if not handler:
+            # No parser for this store yet (e.g. The Warehouse, JB Hi-Fi), so don't spend a request on it
+            return {'status': 'skipped', 'error': 'Store scanning not implemented yet'}
+        
+        logger.info(f"Scanning {config['name']}...")
+        
+        # Every handler goes through here, so timing (like skipping and error capture) is applied uniformly
+        started = time.monotonic()
         try:
-            if store_id == 'novagames_nz':
-                # Nova Games - we know this works perfectly
-                products = await self._scan_nova_games(config)
-                return {'status': 'success', 'products': products}
-                
-            elif store_id == 'cardmerchant_nz':
-                # Card Merchant - bot-friendly Pokemon specialist
-                products = await self._scan_cardmerchant(config)
-                return {'status': 'success', 'products': products}
-                
-            elif store_id == 'ebgames_nz':
-                # EB Games - newly implemented but blocked
-                products = await self._scan_ebgames(config)
-                return {'status': 'success', 'products': products}
-                
-            elif store_id == 'thewarehouse_nz':
-                # Try The Warehouse
-                products = await self._scan_warehouse_nz(config)
-                return {'status': 'success', 'products': products}
-                
-            elif store_id == 'jbhifi_nz':
-                # Try JB Hi-Fi
-                products = await self._scan_jbhifi_nz(config)
-                return {'status': 'success', 'products': products}
-                
-            else:
-                # For other stores, try generic approach
-                return {'status': 'skipped', 'error': 'Store scanning not implemented yet'}
-                
+            products = await handler(config, session)
+            return {'status': 'success', 'products': products}
         except Exception as e:
             return {'status': 'error', 'error': str(e)}
+        finally:
+            logger.info(f"Scanned {config['name']} in {time.monotonic() - started:.1f}s")
     
-    async def _scan_nova_games(self, config: Dict) -> List[Dict]:
-        """Scan Nova Games NZ - we know this works perfectly"""
+    async def _fetch(self, session: aiohttp.ClientSession, url: str,
+                     headers: Optional[Dict] = None) -> Tuple[int, bytes]:
+        """GET a URL with bounded timeouts, retrying timeouts, connection errors, 429 and 5xx
+
+        Returns (status, raw body). Raw bytes let the parsers skip a str decode.
+        Every attempt waits its turn on the host's rate limiter first.
+        """
+        limiter = _host_limiter(url)
+        for attempt in range(FETCH_ATTEMPTS):
+            last_attempt = attempt == FETCH_ATTEMPTS - 1
+            # 1s, 2s plus jitter so concurrent retries don't land on the host together
+            delay = 2 ** attempt + random.uniform(0, 0.5)
+            await limiter.acquire()
+            try:
+                async with session.get(url, headers=headers, timeout=TIMEOUT) as response:
+                    if last_attempt or not (response.status == 429 or response.status >= 500):
+                        return response.status, await response.read()
+                    logger.warning(f"{url} returned status {response.status}, retrying")
+                    retry_after = response.headers.get('Retry-After', '')
+                    if retry_after.isdigit():
+                        # Honour the server's own backoff, capped so one store can't stall the scan
+                        delay = min(int(retry_after), 30)
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if last_attempt:
+                    raise
+                logger.warning(f"Request to {url} failed ({e!r}), retrying")
+            
+            await asyncio.sleep(delay)
+    
+    async def _fetch_and_parse(self, config: Dict, session: aiohttp.ClientSession,
+                               parser: Callable) -> List[Dict]:
+        """Scan a store with one GET of its search page, parsed by the monitor's `parser` for that store"""
+        store_name = config['name']
         products = []
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                async with session.get(config['search_url'], headers=headers) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        # Use the generic monitor's parsing method
-                        products = await self.monitor.parse_nova_games_products(html, config['base_url'])
-                        logger.info(f"Nova Games scan found {len(products)} products")
-                    else:
-                        logger.warning(f"Nova Games returned status {response.status}")
-            except Exception as e:
-                logger.error(f"Error scanning Nova Games: {e}")
+        try:
+            status, body = await self._fetch(session, config['search_url'])
+            if status != 200:
+                logger.warning(f"{store_name} returned status {status}")
+            else:
+                products = await parser(body, config['base_url'])
+                logger.info(f"{store_name} scan found {len(products)} products")
+        except Exception as e:
+            logger.error(f"Error scanning {store_name}: {e}")
         
         return products
     
-    async def _scan_ebgames(self, config: Dict) -> List[Dict]:
-        """Scan EB Games NZ for Pokemon products using Selenium"""
-        products = []
-        
+    async def _scan_ebgames(self, config: Dict, session: aiohttp.ClientSession) -> List[Dict]:
+        """Scan EB Games NZ for Pokemon products using Selenium, falling back to plain HTTP"""
         try:
             logger.info("EB Games scan using Selenium browser automation...")
-            # Run Selenium in a thread to avoid blocking
-            import asyncio
-            import concurrent.futures
-            
-            def run_selenium():
-                return self.monitor.parse_ebgames_products_selenium()
-            
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                products = await asyncio.get_event_loop().run_in_executor(
-                    executor, run_selenium
-                )
+            # Run Selenium on the long-lived browser thread to avoid blocking
+            products = await run_on_selenium_thread(self.monitor.parse_ebgames_products_selenium)
             
             logger.info(f"EB Games Selenium scan found {len(products)} products")
+            if products:
+                return products
         except Exception as e:
             logger.error(f"Error scanning EB Games with Selenium: {e}")
-            # Fallback to regular HTTP scan (will likely get 403 but worth trying)
-            try:
-                async with aiohttp.ClientSession() as session:
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.5',
-                        'Accept-Encoding': 'gzip, deflate, br',
-                        'DNT': '1',
-                        'Connection': 'keep-alive',
-                        'Upgrade-Insecure-Requests': '1',
-                    }
-                    
-                    async with session.get(config['search_url'], headers=headers, timeout=20) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            # Use the generic monitor's EB Games parsing method
-                            products = await self.monitor.parse_ebgames_products(html, config['base_url'])
-                            logger.info(f"EB Games fallback scan found {len(products)} products")
-                        elif response.status == 403:
-                            logger.warning("EB Games returned 403 Forbidden - bot detection confirmed")
-                        else:
-                            logger.warning(f"EB Games returned status {response.status}")
-            except Exception as fallback_error:
-                logger.error(f"EB Games fallback scan also failed: {fallback_error}")
-        
-        return products
-    
-    async def _scan_cardmerchant(self, config: Dict) -> List[Dict]:
-        """Scan Card Merchant NZ for Pokemon products using JSON API"""
-        products = []
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                async with session.get(config['search_url'], headers=headers) as response:
-                    if response.status == 200:
-                        json_data = await response.text()  # Get as text first
-                        # Use the generic monitor's Card Merchant JSON parsing method
-                        products = await self.monitor.parse_cardmerchant_products(json_data, config['base_url'])
-                        logger.info(f"Card Merchant scan found {len(products)} products")
-                    else:
-                        logger.warning(f"Card Merchant returned status {response.status}")
-            except Exception as e:
-                logger.error(f"Error scanning Card Merchant: {e}")
+        # The Selenium parser returns [] when it fails, so an empty result also tries HTTP,
+        # unless the site has recently answered 403 (the fallback would just time out again)
+        host = urlparse(config['search_url']).netloc
+        if _blocked_hosts.get(host):
+            logger.info(f"Skipping EB Games HTTP fallback, {host} blocked us recently")
+            return []
         
-        return products
-    
-    async def _scan_warehouse_nz(self, config: Dict) -> List[Dict]:
-        """Scan The Warehouse NZ for Pokemon products"""
-        products = []
-        search_url = config['search_url'].replace('{query}', 'pokemon+tcg')
-        
-        async with aiohttp.ClientSession() as session:
-            try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                async with session.get(search_url, headers=headers) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        # Parse Warehouse products (would need implementation)
-                        logger.info(f"The Warehouse scan successful - got {len(html)} chars")
-                    else:
-                        logger.warning(f"The Warehouse returned status {response.status}")
-            except Exception as e:
-                logger.error(f"Error scanning The Warehouse: {e}")
-        
-        return products
-    
-    async def _scan_jbhifi_nz(self, config: Dict) -> List[Dict]:
-        """Scan JB Hi-Fi NZ for Pokemon products"""
         products = []
-        search_url = config['search_url'].replace('{query}', 'pokemon%20tcg')
-        
-        async with aiohttp.ClientSession() as session:
-            try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                async with session.get(search_url, headers=headers) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        # Parse JB Hi-Fi products (would need implementation)
-                        logger.info(f"JB Hi-Fi scan successful - got {len(html)} chars")
-                    else:
-                        logger.warning(f"JB Hi-Fi returned status {response.status}")
-            except Exception as e:
-                logger.error(f"Error scanning JB Hi-Fi: {e}")
+        try:
+            status, html = await self._fetch(session, config['search_url'], headers=BROWSER_HEADERS)
+            if status == 200:
+                # Use the generic monitor's EB Games parsing method
+                products = await self.monitor.parse_ebgames_products(html, config['base_url'])
+                logger.info(f"EB Games fallback scan found {len(products)} products")
+            elif status == 403:
+                logger.warning("EB Games returned 403 Forbidden - bot detection confirmed")
+                _blocked_hosts.set(host, True)
+            else:
+                logger.warning(f"EB Games returned status {status}")
+        except Exception as fallback_error:
+            logger.error(f"EB Games fallback scan also failed: {fallback_error}")
         
         return products
     
-    async def _is_new_arrival(self, product: Dict) -> bool:
-        """Check if product is a new arrival (not in database)"""
-        try:
-            # Use the database manager's method to check if product exists
-            products = await self.db_manager.get_products_by_store(product.get('store_name', ''))
-            
-            # Check if this SKU already exists for this store
-            product_sku = product.get('sku', product.get('url', ''))
-            for existing in products:
-                if existing['sku'] == product_sku:
-                    return False  # Product already exists, not new
-            
-            return True  # Product doesn't exist, it's new
-        except Exception as e:
-            logger.error(f"Error checking if product is new arrival: {e}")
+    def _is_new_arrival(self, product: ScannedProduct, existing_skus: Set[Tuple[str, str]]) -> bool:
+        """Check if product is a new arrival (not in database)
+
+        New keys are added to existing_skus so a product listed twice in one
+        scan is only reported once.
+        """
+        key = (product.store_name, product.key)
+        if key in existing_skus:
             return False
+        existing_skus.add(key)
+        return True
+    
+    async def _save_scan_summary(self, conn: aiosqlite.Connection, results: Dict):
+        """Write the daily_scans summary row"""
+        await conn.execute(self._INSERT_SCAN_SQL, (
+            results['scan_date'],
+            results['timestamp'],
+            len(results['stores_scanned']),
+            len(results['products_found']),
+            len(results['new_arrivals']),
+            '; '.join(results['errors']) if results['errors'] else None,
+            f"Scanned {len(results['stores_scanned'])} stores, found {len(results['products_found'])} products"
+        ))
     
     async def _save_scan_results(self, results: Dict):
         """Save scan results to database for historical tracking and stock management"""
+        rows = [
+            (
+                product.key,
+                product.store_name,
+                product.name,
+                product.url,
+                product.price,
+                "In Stock"
+            )
+            for product in results['products_found']
+        ]
+        
         try:
-            # Save to daily_scans table for history
-            conn = sqlite3.connect('data/pokemon_stock.db')
-            cursor = conn.cursor()
-            
-            # Create daily_scans table if it doesn't exist
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS daily_scans (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    scan_date DATE NOT NULL,
-                    scan_time TIMESTAMP NOT NULL,
-                    stores_scanned INTEGER,
-                    products_found INTEGER,
-                    new_arrivals INTEGER,
-                    errors TEXT,
-                    summary TEXT
-                )
-            ''')
-            
-            # Insert scan summary
-            cursor.execute('''
-                INSERT INTO daily_scans (scan_date, scan_time, stores_scanned, products_found, new_arrivals, errors, summary)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                results['timestamp'].date(),
-                results['timestamp'],
-                len(results['stores_scanned']),
-                len(results['products_found']),
-                len(results['new_arrivals']),
-                '; '.join(results['errors']) if results['errors'] else None,
-                f"Scanned {len(results['stores_scanned'])} stores, found {len(results['products_found'])} products"
-            ))
-            
-            conn.commit()
-            conn.close()
-            
-            # Save each product to the stock tracking database
-            for product in results['products_found']:
-                await self._save_product_to_stock_db(product)
+            conn = await self.db_manager.get_conn()
+            async with self.db_manager.write_lock():
+                # Summary row and every product upsert share one transaction (and one fsync)
+                await conn.execute('BEGIN IMMEDIATE')
+                try:
+                    await self._save_scan_summary(conn, results)
+                    if rows:
+                        await self.db_manager.write_scan_rows(conn, rows)
+                    await conn.execute('COMMIT')
+                except BaseException:
+                    await conn.execute('ROLLBACK')
+                    raise
             
         except Exception as e:
             logger.error(f"Error saving scan results: {e}")
     
-    async def _save_product_to_stock_db(self, product: Dict):
-        """Save individual product to stock tracking database"""
-        try:
-            # Extract product data
-            sku = product.get('sku', product.get('url', ''))
-            store_name = product.get('store_name', 'Unknown Store')
-            product_name = product.get('name', 'Unknown Product')
-            product_url = product.get('url', '')
-            price = product.get('price', 0)
-            
-            # Use database manager to upsert the product
-            success, is_new = await self.db_manager.upsert_product_from_scan(
-                sku=sku,
-                store_name=store_name,
-                product_name=product_name,
-                product_url=product_url,
-                price=price,
-                stock_status="In Stock"
-            )
-            
-            if success:
-                status = "Added new" if is_new else "Updated existing"
-                logger.info(f"{status} product: {product_name} from {store_name}")
-            else:
-                logger.error(f"Failed to save product: {product_name} from {store_name}")
-                
-        except Exception as e:
-            logger.error(f"Error saving individual product to stock DB: {e}")
-    
     async def _send_daily_report(self, channel_id: int, results: Dict):
         """Send formatted daily report to Discord channel"""
         try:
@@ -362,15 +395,15 @@ class DailyStockReporter:
             # Create embed report
             embed = discord.Embed(
                 title="🌅 Daily Pokemon Stock Report",
-                description=f"Scan completed at {results['timestamp'].strftime('%I:%M %p')}",
+                description=f"Scan completed at {results['timestamp_str']}",
                 color=0x3498db
             )
             
             # Stores scanned summary
-            stores_summary = []
-            for store in results['stores_scanned']:
-                status_emoji = "✅" if store['status'] == 'success' else "❌" if store['status'] == 'error' else "⏭️"
-                stores_summary.append(f"{status_emoji} **{store['store_name']}**: {store['products_found']} products")
+            stores_summary = [
+                f"{_STATUS_EMOJI.get(store['status'], '❓')} **{store['store_name']}**: {store['products_found']} products"
+                for store in results['stores_scanned']
+            ]
             
             embed.add_field(
                 name="🏪 Stores Scanned",
@@ -380,14 +413,10 @@ class DailyStockReporter:
             
             # New arrivals
             if results['new_arrivals']:
-                arrivals_text = []
-                for product in results['new_arrivals'][:5]:  # Show first 5
-                    price_text = f"${product['price']:.2f}" if product.get('price') and product['price'] > 0 else "Price TBA"
-                    product_name = product.get('name', 'Unknown Product')
-                    # Clean up product name if it's too long or messy
-                    if len(product_name) > 50:
-                        product_name = product_name[:47] + "..."
-                    arrivals_text.append(f"• **{product_name}** - {price_text}\n  📍 {product['store_name']}")
+                arrivals_text = [
+                    f"• **{_short_name(product, 50)}** - {_price_text(product, 'Price TBA')}\n  📍 {product.store_name}"
+                    for product in islice(results['new_arrivals'], 5)  # Show first 5
+                ]
                 
                 embed.add_field(
                     name="🆕 New Arrivals Today",
@@ -397,14 +426,10 @@ class DailyStockReporter:
             
             # Show ALL products found today
             if results['products_found']:
-                all_products_text = []
-                for product in results['products_found'][:10]:  # Show first 10
-                    price_text = f"${product['price']:.2f}" if product.get('price') and product['price'] > 0 else "TBA"
-                    product_name = product.get('name', 'Unknown Product')
-                    # Clean up product name
-                    if len(product_name) > 45:
-                        product_name = product_name[:42] + "..."
-                    all_products_text.append(f"• **{product_name}** - {price_text}")
+                all_products_text = [
+                    f"• **{_short_name(product, 45)}** - {_price_text(product, 'TBA')}"
+                    for product in islice(results['products_found'], 10)  # Show first 10
+                ]
                 
                 if len(results['products_found']) > 10:
                     all_products_text.append(f"... and {len(results['products_found']) - 10} more products")
@@ -446,41 +471,53 @@ class DailyStockReporter:
         except Exception as e:
             logger.error(f"Error sending daily report: {e}")
     
+    async def _read_stock_summary(self) -> Dict:
+        """Read the monitored product count and today's sightings for get_stock_summary"""
+        conn = await self.db_manager.get_conn()
+        
+        # Today's sightings. reported_at is a UTC CURRENT_TIMESTAMP string, so compare
+        # against UTC day boundaries to keep the idx_sightings_reported_at range scan.
+        today_start = datetime.combine(datetime.now(timezone.utc).date(), dt_time.min)
+        tomorrow_start = today_start + timedelta(days=1)
+        day_range = (today_start.strftime('%Y-%m-%d %H:%M:%S'), tomorrow_start.strftime('%Y-%m-%d %H:%M:%S'))
+        
+        async def count_todays_sightings() -> int:
+            async with conn.execute(
+                'SELECT COUNT(*) FROM community_sightings WHERE reported_at >= ? AND reported_at < ?',
+                day_range
+            ) as cursor:
+                (count,) = await cursor.fetchone()
+            return count
+        
+        async def recent_sightings() -> List[tuple]:
+            async with conn.execute('''
+                SELECT store_name, product_name,
+                       CASE WHEN price THEN printf('$%.2f', price) ELSE 'No price' END AS price_text,
+                       user_name AS reported_by, reported_at
+                FROM community_sightings 
+                WHERE reported_at >= ? AND reported_at < ?
+                ORDER BY reported_at DESC
+                LIMIT ?
+            ''', (*day_range, RECENT_SIGHTINGS_LIMIT)) as cursor:
+                return await cursor.fetchall()
+        
+        # Independent reads; the product count usually comes straight from the manager's cache
+        total_monitored, todays_sightings, sightings = await asyncio.gather(
+            self.db_manager.count_products(),
+            count_todays_sightings(),
+            recent_sightings()
+        )
+        
+        return {
+            'community_sightings': sightings,
+            'total_monitored': total_monitored,
+            'todays_sightings': todays_sightings
+        }
+    
     async def get_stock_summary(self) -> Dict:
         """Get current stock summary across all monitored stores"""
         try:
-            conn = sqlite3.connect('data/pokemon_stock.db')
-            cursor = conn.cursor()
-            
-            # Get monitored products with recent stock status
-            cursor.execute('''
-                SELECT store_name, sku, product_name, current_stock_status, last_price, last_checked
-                FROM monitored_products 
-                WHERE is_active = 1
-                ORDER BY last_checked DESC
-            ''')
-            
-            products = cursor.fetchall()
-            
-            # Get community sightings from today
-            cursor.execute('''
-                SELECT store_name, product_name, price, reported_by, reported_at
-                FROM community_sightings 
-                WHERE DATE(reported_at) = DATE('now')
-                ORDER BY reported_at DESC
-            ''')
-            
-            sightings = cursor.fetchall()
-            
-            conn.close()
-            
-            return {
-                'monitored_products': products,
-                'community_sightings': sightings,
-                'total_monitored': len(products),
-                'todays_sightings': len(sightings)
-            }
-            
+            return await self._read_stock_summary()
         except Exception as e:
             logger.error(f"Error getting stock summary: {e}")
             return {}
\ No newline at end of file
@@ -3,21 +3,40 @@
 Daily Scan Scheduler - Handles automatic daily Pokemon stock scans
 """
 import asyncio
-import sqlite3
-from datetime import datetime, time
-from typing import Optional
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Tuple
 from bot.daily_reporter import DailyStockReporter
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Schedules are cached in memory; they're re-read when invalidate() is called (the
+# schedule command does) and at least this often, for edits made outside the bot
+SCHEDULE_REFRESH_SECONDS = 3600
+
+def _next_occurrence(hour: int, minute: int, after: datetime) -> datetime:
+    """Start of the first minute at or after `after` (to the minute) matching hour:minute"""
+    after = after.replace(second=0, microsecond=0)
+    occurrence = after.replace(hour=hour, minute=minute)
+    if occurrence < after:
+        occurrence += timedelta(days=1)
+    return occurrence
+
 class DailyScanScheduler:
     """Handles scheduling and execution of daily stock scans"""
     
     def __init__(self, bot):
         self.bot = bot
         self.reporter = DailyStockReporter(bot)
+        # The bot's manager (via the reporter), so schedules saved by /schedule_daily are read back here
+        self.db_manager = self.reporter.db_manager
         self.running = False
+        # Active (schedule_id, channel_id, hour, minute) rows; None until (re)loaded
+        self._schedules: Optional[List[Tuple[int, int, int, int]]] = None
+        # Set by invalidate() to wake the sleeping scheduler; created when the loop starts
+        self._schedules_changed: Optional[asyncio.Event] = None
+        # Minutes before this have already been checked, so they aren't run twice
+        self._next_check_from = datetime.min
         
     async def start_scheduler(self):
         """Start the daily scan scheduler"""
@@ -26,13 +45,25 @@ class DailyScanScheduler:
             return
             
         self.running = True
+        self._schedules_changed = asyncio.Event()
         logger.info("Daily scan scheduler started")
         
         while self.running:
             try:
-                await self._check_and_run_scheduled_scans()
-                # Check every 5 minutes for scheduled scans
-                await asyncio.sleep(300)
+                if self._schedules is None:
+                    self._schedules = await self._load_schedules()
+                
+                delay = self._seconds_until_next_scan(datetime.now())
+                if delay is None or delay > SCHEDULE_REFRESH_SECONDS:
+                    # Nothing due soon; wake up later (or on invalidate) and re-read the schedules
+                    await self._sleep(SCHEDULE_REFRESH_SECONDS)
+                    self._schedules = None
+                    continue
+                
+                # A second of slack so we wake inside the scheduled minute, never just before it
+                if delay > 0 and await self._sleep(delay + 1):
+                    continue  # Schedules changed while we slept; work out the next run again
+                await self._run_due_scans()
             except Exception as e:
                 logger.error(f"Error in scheduler: {e}")
                 await asyncio.sleep(60)  # Wait 1 minute before retrying
@@ -42,66 +73,56 @@ class DailyScanScheduler:
         self.running = False
         logger.info("Daily scan scheduler stopped")
     
-    async def _check_and_run_scheduled_scans(self):
-        """Check if any scans should run now"""
-        current_time = datetime.now()
-        current_time_str = current_time.strftime('%H:%M')
-        
-        try:
-            conn = sqlite3.connect('data/pokemon_stock.db')
-            cursor = conn.cursor()
-            
-            # Get active schedules for current time (within 5 minutes)
-            cursor.execute('''
-                SELECT guild_id, channel_id, schedule_time, id 
-                FROM daily_schedules 
-                WHERE is_active = 1 AND schedule_time = ?
-            ''', (current_time_str,))
-            
-            schedules = cursor.fetchall()
-            
-            # Check if we already ran today
-            for guild_id, channel_id, schedule_time, schedule_id in schedules:
-                if await self._should_run_scan(schedule_id, current_time.date()):
-                    await self._execute_scheduled_scan(channel_id)
-                    await self._mark_scan_completed(schedule_id, current_time)
-            
-            conn.close()
-            
-        except Exception as e:
-            logger.error(f"Error checking scheduled scans: {e}")
+    def invalidate(self):
+        """Drop the cached schedules so an added or changed schedule takes effect right away"""
+        self._schedules = None
+        if self._schedules_changed is not None:
+            self._schedules_changed.set()
     
-    async def _should_run_scan(self, schedule_id: int, current_date) -> bool:
-        """Check if scan should run (hasn't run today already)"""
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep for up to seconds; returns True if woken early by invalidate()"""
         try:
-            conn = sqlite3.connect('data/pokemon_stock.db')
-            cursor = conn.cursor()
-            
-            # Create scan log table if it doesn't exist
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS scheduled_scan_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    schedule_id INTEGER,
-                    run_date DATE,
-                    run_time TIMESTAMP,
-                    UNIQUE(schedule_id, run_date)
-                )
-            ''')
-            
-            # Check if we already ran today
-            cursor.execute('''
-                SELECT id FROM scheduled_scan_log 
-                WHERE schedule_id = ? AND run_date = ?
-            ''', (schedule_id, current_date))
-            
-            already_ran = cursor.fetchone()
-            conn.close()
-            
-            return already_ran is None
-            
-        except Exception as e:
-            logger.error(f"Error checking if scan should run: {e}")
+            await asyncio.wait_for(self._schedules_changed.wait(), seconds)
+        except asyncio.TimeoutError:
             return False
+        self._schedules_changed.clear()
+        return True
+    
+    async def _load_schedules(self) -> List[Tuple[int, int, int, int]]:
+        """Read every active schedule from the database, parsing its H:MM time once"""
+        conn = await self.db_manager.get_conn()
+        async with conn.execute(
+            'SELECT id, channel_id, schedule_time FROM daily_schedules WHERE is_active = 1'
+        ) as cursor:
+            rows = await cursor.fetchall()
+        
+        schedules = []
+        for schedule_id, channel_id, schedule_time in rows:
+            hour, minute = map(int, schedule_time.split(':'))
+            schedules.append((schedule_id, channel_id, hour, minute))
+        return schedules
+    
+    def _seconds_until_next_scan(self, now: datetime) -> Optional[float]:
+        """Seconds from now until the next cached schedule is due (<= 0 if due now), or None if there are none"""
+        if not self._schedules:
+            return None
+        
+        after = max(now, self._next_check_from)
+        next_run = min(_next_occurrence(hour, minute, after) for _, _, hour, minute in self._schedules)
+        return (next_run - now).total_seconds()
+    
+    async def _run_due_scans(self):
+        """Run every cached schedule due in the current minute that hasn't already run today"""
+        # One clock read per check; every schedule is compared against the same minute
+        current_time = datetime.now()
+        hour, minute = current_time.hour, current_time.minute
+        self._next_check_from = current_time.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        
+        for schedule_id, channel_id, schedule_hour, schedule_minute in self._schedules:
+            if (schedule_hour, schedule_minute) != (hour, minute):
+                continue
+            if await self._claim_scan_run(schedule_id, current_time):
+                await self._execute_scheduled_scan(channel_id)
     
     async def _execute_scheduled_scan(self, channel_id: int):
         """Execute a scheduled scan"""
@@ -112,22 +133,22 @@ class DailyScanScheduler:
         except Exception as e:
             logger.error(f"Error executing scheduled scan: {e}")
     
-    async def _mark_scan_completed(self, schedule_id: int, run_time: datetime):
-        """Mark scan as completed for today"""
+    async def _claim_scan_run(self, schedule_id: int, run_time: datetime) -> bool:
+        """Record today's run for a schedule; False if it was already recorded (already ran today)"""
         try:
-            conn = sqlite3.connect('data/pokemon_stock.db')
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO scheduled_scan_log (schedule_id, run_date, run_time)
-                VALUES (?, ?, ?)
-            ''', (schedule_id, run_time.date(), run_time))
+            conn = await self.db_manager.get_conn()
             
-            conn.commit()
-            conn.close()
+            # Under the write lock so the insert never lands inside another caller's open transaction
+            async with self.db_manager.write_lock():
+                async with conn.execute('''
+                    INSERT OR IGNORE INTO scheduled_scan_log (schedule_id, run_date, run_time)
+                    VALUES (?, ?, ?)
+                ''', (schedule_id, run_time.date(), run_time)) as cursor:
+                    return cursor.rowcount == 1
             
         except Exception as e:
-            logger.error(f"Error marking scan as completed: {e}")
+            logger.error(f"Error recording scheduled scan run: {e}")
+            return False
 
 # Simple standalone script for manual daily scanning
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import discord
 from discord.ext import commands, tasks
+import aiohttp
 import asyncio
 import logging
 from typing import Dict, List, Any
@@ -11,6 +12,8 @@ from monitors.monitor_manager import MonitorManager
 from bot.commands import setup_commands
 from bot.notifications import NotificationManager
 from bot.daily_scheduler import DailyScanScheduler
+from bot.daily_reporter import close_session
+from monitors.generic_monitor import shutdown_selenium
 
 class PokemonStockBot(commands.Bot):
     """Main Discord bot class for Pokemon stock monitoring"""
@@ -19,10 +22,21 @@ class PokemonStockBot(commands.Bot):
         intents = discord.Intents.default()
         # Start with minimal intents - we'll add message_content later
         
+        # discord.py keeps one REST session for the bot's lifetime; give it a
+        # keep-alive pool so notification bursts reuse warm TLS connections.
+        # The session owns the connector and closes it in Client.close().
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        
         super().__init__(
             command_prefix='!',
             intents=intents,
-            help_command=commands.DefaultHelpCommand()
+            help_command=commands.DefaultHelpCommand(),
+            connector=connector
         )
         
         self.config = config
@@ -158,8 +172,12 @@ class PokemonStockBot(commands.Bot):
         self.stock_monitor_loop.cancel()
         self.release_notification_loop.cancel()
         
+        # Quit the warm Selenium browser and close the HTTP session used by daily scans
+        await shutdown_selenium()
+        await close_session()
+        
         # Close database
-        self.db_manager.close()
+        await self.db_manager.close()
         
         # Close bot
         await super().close()
@@ -1,10 +1,45 @@
 import discord
-from typing import List, Dict, Any
+import asyncio
+import functools
+import re
+from typing import List, Dict, Any, Optional, Tuple
 import logging
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 from utils.config import Config
 
+EMBEDS_PER_MESSAGE = 10
+SEND_ATTEMPTS = 3
+MAX_RETRY_DELAY = 30
+
+_POKEMON_RE = re.compile(r'pokemon|pokémon|tcg|card', re.IGNORECASE)
+
+# Embed colour, emoji and title keyed by lowercased stock status
+_STATUS_TABLE = {
+    'in stock': (0x00ff00, "🟢", "🟢 STOCK ALERT - IN STOCK!"),
+    'out of stock': (0xff0000, "🔴", "🔴 STOCK ALERT - OUT OF STOCK"),
+}
+
+# Static parts of the release notification embeds
+_RELEASE_FOOTER = {'text': "Pokemon Stock Bot • Release Alert"}
+_ADVANCE_TEMPLATE = {'title': "📅 UPCOMING POKEMON RELEASE", 'color': 0x3498db, 'footer': _RELEASE_FOOTER}
+_RELEASE_DAY_TEMPLATE = {'title': "🚨 POKEMON RELEASE DAY!", 'color': 0xe74c3c, 'footer': _RELEASE_FOOTER}
+
+# Only ever ping the configured role, never @everyone or users named in product text
+_NO_MENTIONS = discord.AllowedMentions.none()
+
+
+def _allowed_mentions(role: Optional[discord.Role]) -> discord.AllowedMentions:
+    if role is None:
+        return _NO_MENTIONS
+    return discord.AllowedMentions(everyone=False, users=False, roles=[role])
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD release date, memoised since reminders repeat daily"""
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
 class NotificationManager:
     """Handles Discord notifications for stock changes"""
     
@@ -12,37 +47,178 @@ class NotificationManager:
         self.bot = bot
         self.config = config
         self.logger = logging.getLogger(__name__)
+        # Created lazily so it binds to the bot's running event loop
+        self._send_sem: Optional[asyncio.Semaphore] = None
+        
+        # (local date ordinal, "dd/mm/yyyy"), refreshed when the day rolls over
+        self._date_cache: Optional[Tuple[int, str]] = None
+        
+        # Resolved Discord objects, keyed by guild id and channel id
+        self._role_cache: Dict[int, discord.Role] = {}
+        self._channel_cache: Dict[int, discord.abc.Messageable] = {}
+        bot.add_listener(self._on_role_change, 'on_guild_role_create')
+        bot.add_listener(self._on_role_change, 'on_guild_role_delete')
+        bot.add_listener(self._on_role_update, 'on_guild_role_update')
+        bot.add_listener(self._on_channel_delete, 'on_guild_channel_delete')
+    
+    async def _on_role_change(self, role: discord.Role):
+        self._role_cache.pop(role.guild.id, None)
+    
+    async def _on_role_update(self, before: discord.Role, after: discord.Role):
+        self._role_cache.pop(after.guild.id, None)
+    
+    async def _on_channel_delete(self, channel):
+        self._channel_cache.pop(channel.id, None)
+    
+    def _get_channel(self, channel_id: int):
+        """Return the channel for channel_id, caching it once resolved"""
+        channel = self._channel_cache.get(channel_id)
+        if channel is None:
+            channel = self.bot.get_channel(channel_id)
+            if channel is not None:
+                self._channel_cache[channel_id] = channel
+        return channel
+    
+    def _date_string(self) -> str:
+        """Today's local date as dd/mm/yyyy, formatted once per day"""
+        today = date.today()
+        ordinal = today.toordinal()
+        if self._date_cache is None or self._date_cache[0] != ordinal:
+            self._date_cache = (ordinal, today.strftime("%d/%m/%Y"))
+        return self._date_cache[1]
+    
+    @staticmethod
+    def _can_send_embeds(channel) -> bool:
+        """Whether the bot may post embeds in channel (always true outside guilds)"""
+        guild = getattr(channel, 'guild', None)
+        if guild is None or guild.me is None:
+            return True
+        permissions = channel.permissions_for(guild.me)
+        return permissions.send_messages and permissions.embed_links
+    
+    def _get_role(self, channel) -> Optional[discord.Role]:
+        """Return the configured notification role in the channel's guild, if any
+        
+        A configured notification_role_id resolves through the guild's role map;
+        the role name is kept as a fallback for existing configs.
+        """
+        # DMs and other guild-less channels have no roles to mention
+        guild = getattr(channel, 'guild', None)
+        if guild is None:
+            return None
+        
+        role_id = getattr(self.config, 'notification_role_id', None)
+        if role_id:
+            return guild.get_role(int(role_id))
+        
+        if not self.config.notification_role:
+            return None
+        
+        role = self._role_cache.get(guild.id)
+        if role is None:
+            role = discord.utils.get(guild.roles, name=self.config.notification_role)
+            if role is not None:
+                self._role_cache[guild.id] = role
+        return role
     
     async def send_stock_notifications(self, stock_changes: List[Dict[str, Any]]):
         """Send notifications for stock changes"""
         if not stock_changes:
             return
         
+        # A product can flip more than once in one check; only announce its latest state
+        latest: Dict[tuple, Dict[str, Any]] = {}
+        for change in stock_changes:
+            latest[(change.get('store_name'), change.get('sku'))] = change
+        if len(latest) < len(stock_changes):
+            self.logger.info("Dropped %d duplicate stock changes", len(stock_changes) - len(latest))
+            stock_changes = list(latest.values())
+        
         try:
-            channel = self.bot.get_channel(self.config.channel_id)
+            channel = self._get_channel(self.config.channel_id)
             if not channel:
-                self.logger.error(f"Notification channel {self.config.channel_id} not found")
+                self.logger.error("Notification channel %s not found", self.config.channel_id)
                 return
             
-            for change in stock_changes:
-                embed = self._create_stock_embed(change)
-                
-                # Mention role if configured
-                content = None
-                if self.config.notification_role:
-                    role = discord.utils.get(channel.guild.roles, name=self.config.notification_role)
-                    if role:
-                        content = role.mention
-                
-                await channel.send(content=content, embed=embed)
-                
-            self.logger.info(f"Sent {len(stock_changes)} stock notifications")
+            # Bail out before building any embeds if the sends would be rejected
+            if not self._can_send_embeds(channel):
+                self.logger.error("Missing send/embed permissions in channel %s", channel.id)
+                return
+            
+            # Resolve the role mention once for the whole burst
+            role = self._get_role(channel)
+            content = role.mention if role else None
+            mentions = _allowed_mentions(role)
+            
+            now = datetime.now(timezone.utc)
+            date_str = self._date_string()
+            title_cache: Dict[str, str] = {}
+            embeds = [
+                self._create_stock_embed(change, now, date_str, title_cache)
+                for change in stock_changes
+            ]
+            # Discord accepts up to 10 embeds per message
+            batches = [embeds[i:i + EMBEDS_PER_MESSAGE] for i in range(0, len(embeds), EMBEDS_PER_MESSAGE)]
+            
+            if self._send_sem is None:
+                self._send_sem = asyncio.Semaphore(5)
+            
+            # Batches go out in order so the first message, the only one that pings
+            # the role, always arrives first; the semaphore bounds concurrent bursts
+            sent = 0
+            for i, batch in enumerate(batches):
+                try:
+                    await self._send_batch(channel, batch, content if i == 0 else None, mentions)
+                    sent += len(batch)
+                except (discord.HTTPException, discord.RateLimited) as e:
+                    self.logger.error("Error sending stock notification batch: %s", e)
             
+            self.logger.info("Sent %d stock notifications in %d messages", sent, len(batches))
+            
+        except (discord.HTTPException, discord.Forbidden) as e:
+            self.logger.error("Error sending notifications: %s", e)
         except Exception as e:
-            self.logger.error(f"Error sending notifications: {e}")
+            # Never let a notification problem take down the monitor loop or report caller
+            self.logger.error("Unexpected error sending notifications: %s", e)
+    
+    async def _send_batch(self, channel, embeds: List[discord.Embed], content: Optional[str],
+                          mentions: discord.AllowedMentions):
+        """Send one message of embeds, bounded by the shared send semaphore"""
+        async with self._send_sem:
+            await self._send_with_retry(channel, content=content, embeds=embeds, allowed_mentions=mentions)
+    
+    async def _send_with_retry(self, channel, **kwargs):
+        """channel.send with exponential backoff on transient HTTP errors
+        
+        discord.py already waits out ordinary 429s; this covers 5xx responses and
+        RateLimited raised when a bucket's wait exceeds the client's limit.
+        Other 4xx errors (bad request, permissions, missing channel) are raised immediately.
+        """
+        for attempt in range(SEND_ATTEMPTS):
+            try:
+                return await channel.send(**kwargs)
+            except (discord.HTTPException, discord.RateLimited) as e:
+                transient = isinstance(e, discord.RateLimited) or e.status >= 500
+                if not transient or attempt == SEND_ATTEMPTS - 1:
+                    raise
+                delay = getattr(e, 'retry_after', None) or 2 ** attempt
+                delay = min(delay, MAX_RETRY_DELAY)
+                self.logger.warning("Send failed (%s), retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
     
-    def _create_stock_embed(self, change: Dict[str, Any]) -> discord.Embed:
-        """Create embed for stock change notification"""
+    def _create_stock_embed(self, change: Dict[str, Any], now: Optional[datetime] = None,
+                            date_str: Optional[str] = None,
+                            title_cache: Optional[Dict[str, str]] = None) -> discord.Embed:
+        """Create embed for stock change notification
+        
+        Batch callers pass now/date_str so every embed in a burst shares one timestamp,
+        and a title_cache so each store name is title-cased once per burst.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+        if date_str is None:
+            date_str = self._date_string()
+        
         stock_status = change.get('stock_status', 'Unknown')
         sku = change.get('sku', 'Unknown')
         store = change.get('store_name', 'Unknown')
@@ -51,137 +227,92 @@ class NotificationManager:
         product_url = change.get('product_url')
         
         # Determine embed color and emoji based on stock status
-        if stock_status.lower() == 'in stock':
-            color = 0x00ff00  # Green
-            emoji = "🟢"
-            title = f"{emoji} STOCK ALERT - IN STOCK!"
-        elif stock_status.lower() == 'out of stock':
-            color = 0xff0000  # Red
-            emoji = "🔴"
-            title = f"{emoji} STOCK ALERT - OUT OF STOCK"
-        else:
-            color = self.config.embed_color
-            emoji = "🟡"
-            title = f"{emoji} STOCK ALERT - STATUS UPDATE"
-        
-        embed = discord.Embed(
-            title=title,
-            url=product_url if product_url else None,
-            color=color,
-            timestamp=datetime.now(timezone.utc)
-        )
-        
-        # Add product information in the style you requested
-        if product_name:
-            embed.add_field(
-                name="📦 Item",
-                value=product_name,
-                inline=False
-            )
-        
-        embed.add_field(
-            name="🏪 Store",
-            value=store.title(),
-            inline=True
+        color, emoji, title = _STATUS_TABLE.get(
+            stock_status.lower(),
+            (self.config.embed_color, "🟡", "🟡 STOCK ALERT - STATUS UPDATE")
         )
         
-        embed.add_field(
-            name="🔢 SKU",
-            value=f"`{sku}`",
-            inline=True
-        )
+        if title_cache is None:
+            store_title = store.title()
+        else:
+            store_title = title_cache.get(store)
+            if store_title is None:
+                store_title = title_cache[store] = store.title()
         
-        embed.add_field(
-            name="📍 Location",
-            value="Online",
-            inline=True
-        )
+        # Build the embed payload directly; Embed.from_dict skips the per-field
+        # add_field method calls and is the same shape discord.py serialises
+        fields = []
+        if product_name:
+            fields.append({'name': "📦 Item", 'value': product_name, 'inline': False})
         
-        embed.add_field(
-            name="📊 Stock Status",
-            value=f"{emoji} {stock_status}",
-            inline=True
-        )
+        fields.extend((
+            {'name': "🏪 Store", 'value': store_title, 'inline': True},
+            {'name': "🔢 SKU", 'value': f"`{sku}`", 'inline': True},
+            {'name': "📍 Location", 'value': "Online", 'inline': True},
+            {'name': "📊 Stock Status", 'value': f"{emoji} {stock_status}", 'inline': True},
+        ))
         
         if price:
-            embed.add_field(
-                name="💰 Price",
-                value=f"${price:.2f}",
-                inline=True
-            )
+            fields.append({'name': "💰 Price", 'value': f"${price:.2f}", 'inline': True})
         
-        # Add current date
-        current_date = datetime.now().strftime("%d/%m/%Y")
-        embed.add_field(
-            name="📅 Last Checked",
-            value=current_date,
-            inline=True
-        )
+        fields.append({'name': "📅 Last Checked", 'value': date_str, 'inline': True})
         
         # Add product URL as button-style link if available
         if product_url:
-            embed.add_field(
-                name="🔗 Product Link",
-                value=f"[View on {store.title()}]({product_url})",
-                inline=False
-            )
+            fields.append({
+                'name': "🔗 Product Link",
+                'value': f"[View on {store_title}]({product_url})",
+                'inline': False
+            })
         
-        # Add footer with bot info
-        embed.set_footer(
-            text="Pokemon Stock Bot • Real-time monitoring",
-            icon_url=None
-        )
+        payload = {
+            'title': title,
+            'color': color,
+            'timestamp': now.isoformat(),
+            'fields': fields,
+            'footer': {'text': "Pokemon Stock Bot • Real-time monitoring"},
+        }
+        if product_url:
+            payload['url'] = product_url
         
-        # Add thumbnail if it's Pokemon related
-        if any(word in (product_name or '').lower() for word in ['pokemon', 'pokémon', 'tcg', 'card']):
-            # You can add a Pokemon logo thumbnail here
-            pass
+        # Add thumbnail if it's Pokemon related and one is configured
+        thumbnail_url = getattr(self.config, 'pokemon_thumbnail_url', None)
+        if thumbnail_url and product_name and _POKEMON_RE.search(product_name):
+            payload['thumbnail'] = {'url': thumbnail_url}
         
-        return embed
+        return discord.Embed.from_dict(payload)
     
     async def send_error_notification(self, error_message: str):
         """Send error notification to channel"""
-        try:
-            channel = self.bot.get_channel(self.config.channel_id)
-            if not channel:
-                return
-            
-            embed = discord.Embed(
-                title="⚠️ Bot Error",
-                description=error_message,
-                color=0xff0000,
-                timestamp=datetime.now(timezone.utc)
-            )
-            
-            await channel.send(embed=embed)
-            
-        except Exception as e:
-            self.logger.error(f"Error sending error notification: {e}")
+        await self._emit(self.config.channel_id, "⚠️ Bot Error", error_message, 0xff0000)
     
     async def send_status_update(self, message: str):
         """Send general status update"""
+        await self._emit(self.config.channel_id, "ℹ️ Bot Status", message, self.config.embed_color)
+    
+    async def _emit(self, channel_id: int, title: str, description: str, color: int):
+        """Send a single titled embed to channel_id, logging rather than raising on failure"""
+        channel = self._get_channel(channel_id)
+        if not channel:
+            return
+        
+        embed = discord.Embed(
+            title=title,
+            description=description,
+            color=color,
+            timestamp=datetime.now(timezone.utc)
+        )
+        
         try:
-            channel = self.bot.get_channel(self.config.channel_id)
-            if not channel:
-                return
-            
-            embed = discord.Embed(
-                title="ℹ️ Bot Status",
-                description=message,
-                color=self.config.embed_color,
-                timestamp=datetime.now(timezone.utc)
-            )
-            
-            await channel.send(embed=embed)
-            
-        except Exception as e:
-            self.logger.error(f"Error sending status update: {e}")
+            await self._send_with_retry(channel, embed=embed, allowed_mentions=_NO_MENTIONS)
+        except (discord.HTTPException, discord.Forbidden, discord.RateLimited) as e:
+            self.logger.error("Error sending %r notification: %s", title, e)
     
     async def send_release_notification(self, release: Dict[str, Any], notification_type: str = "advance"):
         """Send notification for upcoming release"""
         try:
             # Use the dedicated upcoming releases channel
-            channel = self.bot.get_channel(int(self.config.upcoming_releases_channel))
+            channel = self._get_channel(int(self.config.upcoming_releases_channel))
             if not channel:
                 self.logger.error("Upcoming releases channel not found")
                 return
@@ -189,83 +320,48 @@ class NotificationManager:
             # Create different embeds based on notification type
             if notification_type == "advance":
                 # Advance notification (7 days before)
-                embed = discord.Embed(
-                    title="📅 UPCOMING POKEMON RELEASE",
-                    description=f"**{release['product_name']}** is coming soon!",
-                    color=0x3498db,
-                    timestamp=datetime.now(timezone.utc)
-                )
-                
-                embed.add_field(
-                    name="🗓️ Release Date",
-                    value=release['release_date'],
-                    inline=True
-                )
+                payload = dict(_ADVANCE_TEMPLATE)
+                payload['description'] = f"**{release['product_name']}** is coming soon!"
                 
-                # Calculate days until release
-                release_date = datetime.strptime(release['release_date'], '%Y-%m-%d').date()
-                today = datetime.now().date()
-                days_until = (release_date - today).days
-                
-                embed.add_field(
-                    name="⏰ Days Until Release",
-                    value=f"{days_until} days",
-                    inline=True
-                )
+                # Ordinal subtraction gives whole days without building a timedelta
+                days_until = _parse_date(release['release_date']).toordinal() - date.today().toordinal()
+                fields = [
+                    {'name': "🗓️ Release Date", 'value': release['release_date'], 'inline': True},
+                    {'name': "⏰ Days Until Release", 'value': f"{days_until} days", 'inline': True},
+                ]
                 
             else:  # release day
-                # Release day notification
-                embed = discord.Embed(
-                    title="🚨 POKEMON RELEASE DAY!",
-                    description=f"**{release['product_name']}** is OUT NOW!",
-                    color=0xe74c3c,
-                    timestamp=datetime.now(timezone.utc)
-                )
-                
-                embed.add_field(
-                    name="🎯 Released Today",
-                    value=release['release_date'],
-                    inline=True
-                )
+                payload = dict(_RELEASE_DAY_TEMPLATE)
+                payload['description'] = f"**{release['product_name']}** is OUT NOW!"
+                fields = [
+                    {'name': "🎯 Released Today", 'value': release['release_date'], 'inline': True},
+                ]
             
             # Common fields for both notification types
             if release.get('estimated_price'):
-                embed.add_field(
-                    name="💰 Price",
-                    value=f"${release['estimated_price']:.2f}",
-                    inline=True
-                )
+                fields.append({'name': "💰 Price", 'value': f"${release['estimated_price']:.2f}", 'inline': True})
             
             if release.get('store_name'):
-                embed.add_field(
-                    name="🏪 Store",
-                    value=release['store_name'],
-                    inline=True
-                )
+                fields.append({'name': "🏪 Store", 'value': release['store_name'], 'inline': True})
             
             if release.get('description'):
-                embed.add_field(
-                    name="📝 Description",
-                    value=release['description'],
-                    inline=False
-                )
+                fields.append({'name': "📝 Description", 'value': release['description'], 'inline': False})
             
-            embed.set_footer(
-                text="Pokemon Stock Bot • Release Alert",
-                icon_url=None
-            )
+            payload['fields'] = fields
+            payload['timestamp'] = datetime.now(timezone.utc).isoformat()
+            embed = discord.Embed.from_dict(payload)
             
             # Mention role if configured
             content = None
-            if self.config.notification_role:
-                role = discord.utils.get(channel.guild.roles, name=self.config.notification_role)
-                if role:
-                    if notification_type == "advance":
-                        content = f"{role.mention} Upcoming release reminder!"
-                    else:
-                        content = f"{role.mention} New release available NOW!"
+            role = self._get_role(channel)
+            if role:
+                if notification_type == "advance":
+                    content = f"{role.mention} Upcoming release reminder!"
+                else:
+                    content = f"{role.mention} New release available NOW!"
             
-            await channel.send(content=content, embed=embed)
+            await self._send_with_retry(channel, content=content, embed=embed,
+                                        allowed_mentions=_allowed_mentions(role))
             self.logger.info("Sent %s notification for %s", notification_type, release['product_name'])
             
         except (discord.HTTPException, discord.Forbidden) as e:
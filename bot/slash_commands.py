@@ -1,10 +1,29 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import Optional
+from typing import Optional, Set
+import asyncio
 import logging
+import re
 
-from utils.helpers import clean_sku
+from utils.helpers import clean_sku, format_product_list
+
+# 24h H:MM or HH:MM, as accepted by /schedule_daily
+_TIME_RE = re.compile(r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$')
+
+# Stores offered by /add_sku (value is the store id) and /report_sighting (value is the display name)
+_NZ_STORES = (
+    ("Nova Games NZ", "novagames_nz"),
+    ("EB Games NZ", "ebgames_nz"),
+    ("The Warehouse NZ", "thewarehouse_nz"),
+    ("JB Hi-Fi NZ", "jbhifi_nz"),
+    ("Kmart NZ", "kmart_nz"),
+    ("Farmers NZ", "farmers_nz"),
+)
+_NZ_STORE_CHOICES = [app_commands.Choice(name=name, value=store_id) for name, store_id in _NZ_STORES]
+_NZ_STORE_CHOICES_DISPLAY = [app_commands.Choice(name=name, value=name) for name, _ in _NZ_STORES] + [
+    app_commands.Choice(name="Other NZ Store", value="Other"),
+]
 
 class SlashCommands(commands.Cog):
     """Slash command implementations for the Pokemon Stock Bot"""
@@ -12,6 +31,22 @@ class SlashCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
+        # DailyStockReporter keeps no per-scan state, so reuse the scheduler's instance
+        # rather than building a new monitor and store config per command
+        self.reporter = bot.daily_scheduler.reporter
+        # Strong references to in-flight channel broadcasts so they aren't garbage collected
+        self._bg_tasks: Set[asyncio.Task] = set()
+    
+    def _broadcast(self, channel, embed: discord.Embed):
+        """Post embed to channel in the background so the caller can reply to the user straight away"""
+        task = asyncio.create_task(channel.send(embed=embed))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_broadcast_done)
+    
+    def _on_broadcast_done(self, task: asyncio.Task):
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error("Error broadcasting to channel: %s", task.exception())
     
     @app_commands.command(name="add_sku", description="Add a SKU to monitor for stock changes")
     @app_commands.describe(
@@ -19,14 +54,7 @@ class SlashCommands(commands.Cog):
         store="The store name",
         product_name="Optional product name"
     )
-    @app_commands.choices(store=[
-        app_commands.Choice(name="Nova Games NZ", value="novagames_nz"),
-        app_commands.Choice(name="EB Games NZ", value="ebgames_nz"),
-        app_commands.Choice(name="The Warehouse NZ", value="thewarehouse_nz"),
-        app_commands.Choice(name="JB Hi-Fi NZ", value="jbhifi_nz"),
-        app_commands.Choice(name="Kmart NZ", value="kmart_nz"),
-        app_commands.Choice(name="Farmers NZ", value="farmers_nz"),
-    ])
+    @app_commands.choices(store=_NZ_STORE_CHOICES)
     async def add_sku_slash(
         self, 
         interaction: discord.Interaction, 
@@ -35,7 +63,7 @@ class SlashCommands(commands.Cog):
         product_name: Optional[str] = None
     ):
         """Add a SKU to monitor via slash command"""
-        await interaction.response.defer()
+        await interaction.response.defer(thinking=True)
         
         try:
             clean_sku_value = clean_sku(sku)
@@ -66,40 +94,26 @@ class SlashCommands(commands.Cog):
     @app_commands.command(name="list_skus", description="List all monitored SKUs")
     async def list_skus_slash(self, interaction: discord.Interaction):
         """List all monitored SKUs via slash command"""
-        await interaction.response.defer()
+        await interaction.response.defer(thinking=True)
         
         try:
-            products = await self.bot.db_manager.get_all_products()
+            # Grouping and the 10-per-store cap are done by the database query
+            stores = await self.bot.db_manager.get_products_grouped(limit_per_store=10)
             
-            if not products:
+            if not stores:
                 await interaction.followup.send("📭 No SKUs are currently being monitored.")
                 return
             
+            total_products = sum(store_products[0]['store_total'] for store_products in stores.values())
+            
             embed = discord.Embed(
                 title="📋 Monitored SKUs",
-                description=f"Currently monitoring {len(products)} products",
+                description=f"Currently monitoring {total_products} products",
                 color=self.bot.config.embed_color
             )
             
-            # Group by store
-            stores = {}
-            for product in products:
-                store = product['store_name']
-                if store not in stores:
-                    stores[store] = []
-                stores[store].append(product)
-            
             for store, store_products in stores.items():
-                product_list = []
-                for product in store_products[:10]:  # Limit to 10 per store
-                    status_emoji = "🟢" if product['current_stock_status'] == 'In Stock' else "🔴"
-                    product_info = f"{status_emoji} {product['sku']}"
-                    if product['product_name']:
-                        product_info += f" - {product['product_name'][:30]}..."
-                    product_list.append(product_info)
-                
-                if len(store_products) > 10:
-                    product_list.append(f"... and {len(store_products) - 10} more")
+                product_list = format_product_list(store_products)
                 
                 embed.add_field(
                     name=f"🏪 {store.title()}",
@@ -116,10 +130,10 @@ class SlashCommands(commands.Cog):
     @app_commands.command(name="info", description="Display bot information and statistics")
     async def info_slash(self, interaction: discord.Interaction):
         """Display bot information via slash command"""
-        await interaction.response.defer()
+        await interaction.response.defer(thinking=True)
         
         try:
-            products = await self.bot.db_manager.get_all_products()
+            product_count = await self.bot.db_manager.count_products()
             
             embed = discord.Embed(
                 title="🤖 Pokemon Stock Bot Info",
@@ -127,7 +141,7 @@ class SlashCommands(commands.Cog):
                 color=self.bot.config.embed_color
             )
             
-            embed.add_field(name="Monitored Products", value=len(products), inline=True)
+            embed.add_field(name="Monitored Products", value=product_count, inline=True)
             embed.add_field(name="Check Interval", value=f"{self.bot.config.check_interval}s", inline=True)
             embed.add_field(name="Supported Stores", value="Pokemon Center\nBest Buy\n(More coming soon)", inline=True)
             
@@ -161,7 +175,7 @@ class SlashCommands(commands.Cog):
         description: Optional[str] = None
     ):
         """Add upcoming release via slash command"""
-        await interaction.response.defer()
+        await interaction.response.defer(thinking=True)
         
         try:
             success = await self.bot.db_manager.add_upcoming_release(
@@ -201,15 +215,7 @@ class SlashCommands(commands.Cog):
         stock_count="How many items were available",
         price="Price you saw (optional)",
     )
-    @app_commands.choices(store_name=[
-        app_commands.Choice(name="Nova Games NZ", value="Nova Games NZ"),
-        app_commands.Choice(name="EB Games NZ", value="EB Games NZ"),
-        app_commands.Choice(name="The Warehouse NZ", value="The Warehouse NZ"),
-        app_commands.Choice(name="JB Hi-Fi NZ", value="JB Hi-Fi NZ"),
-        app_commands.Choice(name="Kmart NZ", value="Kmart NZ"),
-        app_commands.Choice(name="Farmers NZ", value="Farmers NZ"),
-        app_commands.Choice(name="Other NZ Store", value="Other"),
-    ])
+    @app_commands.choices(store_name=_NZ_STORE_CHOICES_DISPLAY)
     async def report_sighting(
         self, 
         interaction: discord.Interaction, 
@@ -220,7 +226,7 @@ class SlashCommands(commands.Cog):
         price: Optional[float] = None
     ):
         """Report community sighting via slash command"""
-        await interaction.response.defer()
+        await interaction.response.defer(thinking=True)
         
         try:
             sighting_id = await self.bot.db_manager.add_community_sighting(
@@ -252,7 +258,7 @@ class SlashCommands(commands.Cog):
                 if community_channel_id and community_channel_id != "your_community_sightings_channel_id":
                     channel = self.bot.get_channel(int(community_channel_id))
                     if channel:
-                        await channel.send(embed=embed)
+                        self._broadcast(channel, embed)
                 
                 await interaction.followup.send("✅ Your sighting has been reported! Thank you for helping the community!")
             else:
@@ -275,7 +281,7 @@ class SlashCommands(commands.Cog):
         notes: Optional[str] = None
     ):
         """Verify community sighting via slash command (Mods only)"""
-        await interaction.response.defer()
+        await interaction.response.defer(thinking=True)
         
         try:
             success = await self.bot.db_manager.verify_sighting(
@@ -300,7 +306,7 @@ class SlashCommands(commands.Cog):
                 if verified_channel_id and verified_channel_id != "your_verified_sightings_channel_id":
                     channel = self.bot.get_channel(int(verified_channel_id))
                     if channel:
-                        await channel.send(embed=embed)
+                        self._broadcast(channel, embed)
                 
                 await interaction.followup.send(f"✅ Sighting #{sighting_id} has been verified!")
             else:
@@ -314,32 +320,35 @@ class SlashCommands(commands.Cog):
     @app_commands.default_permissions(manage_messages=True)
     async def pending_sightings(self, interaction: discord.Interaction):
         """View pending sightings via slash command (Mods only)"""
-        await interaction.response.defer()
+        await interaction.response.defer(thinking=True)
         
         try:
-            sightings = await self.bot.db_manager.get_unverified_sightings()
+            # Only the 10 shown rows are fetched; total_pending counts the rest
+            sightings = await self.bot.db_manager.get_unverified_sightings(limit=10)
             
             if not sightings:
                 await interaction.followup.send("📭 No pending sightings to verify.")
                 return
             
+            total_pending = sightings[0]['total_pending']
+            
             embed = discord.Embed(
                 title="⏳ Pending Sightings for Verification",
-                description=f"{len(sightings)} sightings awaiting verification",
+                description=f"{total_pending} sightings awaiting verification",
                 color=0xff9900
             )
             
-            for sighting in sightings[:10]:  # Limit to 10
+            for sighting in sightings:
                 embed.add_field(
                     name=f"ID: {sighting['id']} - {sighting['product_name']}",
                     value=f"**Store:** {sighting['store_name']}\n**Location:** {sighting['location']}\n**Reported by:** {sighting['user_name']}",
                     inline=True
                 )
             
-            if len(sightings) > 10:
+            if total_pending > len(sightings):
                 embed.add_field(
                     name="More sightings...",
-                    value=f"And {len(sightings) - 10} more pending verification",
+                    value=f"And {total_pending - len(sightings)} more pending verification",
                     inline=False
                 )
             
@@ -362,14 +371,9 @@ class SlashCommands(commands.Cog):
         await interaction.response.defer(thinking=True)
         
         try:
-            # Import here to avoid circular imports
-            from bot.daily_reporter import DailyStockReporter
-            
-            reporter = DailyStockReporter(self.bot)
-            
             # Perform the scan
             report_channel_id = interaction.channel.id if send_report else None
-            scan_results = await reporter.perform_daily_scan(report_channel_id)
+            scan_results = await self.reporter.perform_daily_scan(report_channel_id)
             
             # Send immediate response
             total_products = len(scan_results['products_found'])
@@ -406,14 +410,10 @@ class SlashCommands(commands.Cog):
     @app_commands.command(name="stock_summary", description="Get a summary of current monitored products and today's sightings")
     async def stock_summary_slash(self, interaction: discord.Interaction):
         """Slash command to get stock summary"""
-        await interaction.response.defer()
+        await interaction.response.defer(thinking=True)
         
         try:
-            # Import here to avoid circular imports
-            from bot.daily_reporter import DailyStockReporter
-            
-            reporter = DailyStockReporter(self.bot)
-            summary = await reporter.get_stock_summary()
+            summary = await self.reporter.get_stock_summary()
             
             embed = discord.Embed(
                 title="📊 Current Stock Summary",
@@ -441,8 +441,8 @@ class SlashCommands(commands.Cog):
             if summary.get('community_sightings'):
                 recent_sightings = []
                 for sighting in summary['community_sightings'][:3]:
-                    store, product, price, reporter, reported_at = sighting
-                    price_text = f"${price:.2f}" if price else "No price"
+                    # price_text is formatted by the summary query
+                    store, product, price_text, reporter, reported_at = sighting
                     recent_sightings.append(f"• **{product}** - {price_text}\n  📍 {store} (by {reporter})")
                 
                 embed.add_field(
@@ -471,48 +471,29 @@ class SlashCommands(commands.Cog):
         time: str
     ):
         """Slash command to schedule daily scans"""
+        # Acknowledge before any other work; a refusal is only shown to the caller
+        is_admin = interaction.user.guild_permissions.administrator
+        await interaction.response.defer(thinking=True, ephemeral=not is_admin)
+        
         # Check if user has permissions (you might want to add role checks)
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ You need administrator permissions to schedule daily scans.", ephemeral=True)
+        if not is_admin:
+            await interaction.followup.send("❌ You need administrator permissions to schedule daily scans.", ephemeral=True)
             return
-            
-        await interaction.response.defer()
         
         try:
             # Validate time format
-            import re
-            if not re.match(r'^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$', time):
+            if not _TIME_RE.match(time):
                 await interaction.followup.send("❌ Invalid time format. Please use 24h format like '08:00' or '20:30'")
                 return
             
-            # Save schedule to database
-            import sqlite3
-            conn = sqlite3.connect('data/pokemon_stock.db')
-            cursor = conn.cursor()
-            
-            # Create schedule table if it doesn't exist
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS daily_schedules (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    guild_id INTEGER NOT NULL,
-                    channel_id INTEGER NOT NULL,
-                    schedule_time TEXT NOT NULL,
-                    is_active BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Remove existing schedule for this guild
-            cursor.execute('DELETE FROM daily_schedules WHERE guild_id = ?', (interaction.guild.id,))
-            
-            # Add new schedule
-            cursor.execute('''
-                INSERT INTO daily_schedules (guild_id, channel_id, schedule_time) 
-                VALUES (?, ?, ?)
-            ''', (interaction.guild.id, channel.id, time))
+            # Save schedule through the bot's shared async connection so the event loop never blocks on disk I/O
+            saved = await self.bot.db_manager.upsert_daily_schedule(interaction.guild.id, channel.id, time)
+            if not saved:
+                await interaction.followup.send("❌ Failed to save the daily scan schedule.")
+                return
             
-            conn.commit()
-            conn.close()
+            # Let the running scheduler pick up the new time without waiting for its next refresh
+            self.bot.daily_scheduler.invalidate()
             
             embed = discord.Embed(
                 title="⏰ Daily Scan Scheduled",
@@ -1,15 +1,25 @@
 import aiosqlite
+import asyncio
 import os
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
+from utils.cache import TTLCache
 from utils.logger import setup_logger
 
+# One long-lived connection per database file, shared by every DatabaseManager instance
+_shared_connections: Dict[str, aiosqlite.Connection] = {}
+_shared_locks: Dict[str, asyncio.Lock] = {}
+# Short-lived cache for read-heavy command queries per database file, cleared on product writes
+_query_caches: Dict[str, TTLCache] = {}
+
 class DatabaseManager:
     """Manages SQLite database operations for the Pokemon Stock Bot"""
     
     def __init__(self, db_path: str = "data/pokemon_stock.db"):
         self.db_path = db_path
         self.logger = setup_logger(__name__)
+        # Shared per path so a write through any manager invalidates every manager's reads
+        self._query_cache = _query_caches.setdefault(db_path, TTLCache(maxsize=16, ttl=30))
         
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
@@ -86,6 +96,63 @@ class DatabaseManager:
                 )
             ''')
             
+            # Daily scan history written by the daily reporter
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS daily_scans (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scan_date DATE NOT NULL,
+                    scan_time TIMESTAMP NOT NULL,
+                    stores_scanned INTEGER,
+                    products_found INTEGER,
+                    new_arrivals INTEGER,
+                    errors TEXT,
+                    summary TEXT
+                )
+            ''')
+            
+            # One row per schedule per day, so a scheduled scan never runs twice in a day
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS scheduled_scan_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    schedule_id INTEGER,
+                    run_date DATE,
+                    run_time TIMESTAMP,
+                    UNIQUE(schedule_id, run_date)
+                )
+            ''')
+            
+            # One daily scan schedule per guild
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS daily_schedules (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    guild_id INTEGER NOT NULL UNIQUE,
+                    channel_id INTEGER NOT NULL,
+                    schedule_time TEXT NOT NULL,
+                    is_active BOOLEAN DEFAULT 1,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # Tables created before guild_id was UNIQUE get the constraint as an index
+            await db.execute(
+                'CREATE UNIQUE INDEX IF NOT EXISTS idx_schedules_guild ON daily_schedules(guild_id)'
+            )
+            # The scheduler now loads all active schedules at once and orders them in Python
+            await db.execute('DROP INDEX IF EXISTS idx_schedules_active_time')
+            
+            # No query orders all active products by last_checked any more; drop the
+            # index older databases still carry so scan upserts don't maintain it
+            await db.execute('DROP INDEX IF EXISTS idx_monitored_active_checked')
+            
+            # Recent stock changes are a checked_at range over a table that only grows
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_stock_history_checked_at ON stock_history(checked_at)'
+            )
+            
+            # Lets "today's sightings" queries range-scan instead of reading every row
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_sightings_reported_at ON community_sightings(reported_at)'
+            )
+            
             await db.commit()
             self.logger.info("Database initialized successfully")
     
@@ -99,6 +166,7 @@ class DatabaseManager:
                     VALUES (?, ?, ?, ?)
                 ''', (sku, store_name, product_name, product_url))
                 await db.commit()
+                self._query_cache.invalidate()
                 self.logger.info(f"Added product {sku} from {store_name}")
                 return True
         except Exception as e:
@@ -117,6 +185,7 @@ class DatabaseManager:
                 else:
                     await db.execute('DELETE FROM monitored_products WHERE sku = ?', (sku,))
                 await db.commit()
+                self._query_cache.invalidate()
                 self.logger.info(f"Removed product {sku}")
                 return True
         except Exception as e:
@@ -125,6 +194,10 @@ class DatabaseManager:
     
     async def get_all_products(self) -> List[Dict[str, Any]]:
         """Get all monitored products"""
+        cached = self._query_cache.get('all_products')
+        if cached is not None:
+            return cached
+        
         try:
             async with aiosqlite.connect(self.db_path) as db:
                 db.row_factory = aiosqlite.Row
@@ -132,11 +205,66 @@ class DatabaseManager:
                     'SELECT * FROM monitored_products WHERE is_active = 1'
                 ) as cursor:
                     rows = await cursor.fetchall()
-                    return [dict(row) for row in rows]
+            products = [dict(row) for row in rows]
+            self._query_cache.set('all_products', products)
+            return products
         except Exception as e:
             self.logger.error(f"Error getting products: {e}")
             return []
     
+    async def count_products(self) -> int:
+        """Number of actively monitored products, without materialising the rows"""
+        cached = self._query_cache.get('product_count')
+        if cached is not None:
+            return cached
+        
+        try:
+            db = await self.get_conn()
+            async with db.execute('SELECT COUNT(*) FROM monitored_products WHERE is_active = 1') as cursor:
+                (count,) = await cursor.fetchone()
+            self._query_cache.set('product_count', count)
+            return count
+        except Exception as e:
+            self.logger.error(f"Error counting products: {e}")
+            return 0
+    
+    async def get_products_grouped(self, limit_per_store: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """Get active products grouped by store, at most limit_per_store rows each
+
+        Grouping and the per-store cap happen in SQL. Every row also carries a
+        store_total column with the full number of active products for its store.
+        """
+        cache_key = ('products_grouped', limit_per_store)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                async with db.execute('''
+                    SELECT * FROM (
+                        SELECT store_name, sku, product_name, current_stock_status,
+                               ROW_NUMBER() OVER (PARTITION BY store_name ORDER BY id) AS rn,
+                               COUNT(*) OVER (PARTITION BY store_name) AS store_total
+                        FROM monitored_products
+                        WHERE is_active = 1
+                    )
+                    WHERE rn <= ?
+                    ORDER BY store_name, rn
+                ''', (limit_per_store,)) as cursor:
+                    rows = await cursor.fetchall()
+
+            stores: Dict[str, List[Dict[str, Any]]] = {}
+            for row in rows:
+                stores.setdefault(row['store_name'], []).append(dict(row))
+
+            self._query_cache.set(cache_key, stores)
+            return stores
+        except Exception as e:
+            self.logger.error(f"Error getting grouped products: {e}")
+            return {}
+
     async def update_stock_status(self, product_id: int, stock_status: str, price: float = None) -> bool:
         """Update product stock status and add to history"""
         try:
@@ -155,6 +283,7 @@ class DatabaseManager:
                 ''', (product_id, stock_status, price))
                 
                 await db.commit()
+                self._query_cache.invalidate()
                 return True
         except Exception as e:
             self.logger.error(f"Error updating stock status: {e}")
@@ -170,9 +299,9 @@ class DatabaseManager:
                            sh.stock_status, sh.price, sh.checked_at
                     FROM stock_history sh
                     JOIN monitored_products mp ON sh.product_id = mp.id
-                    WHERE sh.checked_at >= datetime('now', '-{} minutes')
+                    WHERE sh.checked_at >= datetime('now', ?)
                     ORDER BY sh.checked_at DESC
-                '''.format(minutes)) as cursor:
+                ''', (f'-{int(minutes)} minutes',)) as cursor:
                     rows = await cursor.fetchall()
                     return [dict(row) for row in rows]
         except Exception as e:
@@ -214,6 +343,7 @@ class DatabaseManager:
                     ''', (product_id, stock_status, price))
                     
                     await db.commit()
+                    self._query_cache.invalidate()
                     self.logger.info(f"Updated existing product {sku} from {store_name}")
                     return True, False  # Success, not new
                 else:
@@ -233,6 +363,7 @@ class DatabaseManager:
                     ''', (product_id, stock_status, price))
                     
                     await db.commit()
+                    self._query_cache.invalidate()
                     self.logger.info(f"Added new product {sku} from {store_name}")
                     return True, True  # Success, is new
                     
@@ -240,6 +371,51 @@ class DatabaseManager:
             self.logger.error(f"Error upserting product from scan: {e}")
             return False, False
     
+    async def write_scan_rows(self, db: aiosqlite.Connection, rows: List[tuple]):
+        """
+        Upsert scanned products on a caller-owned connection without committing,
+        so the caller can fold them into a larger transaction
+        """
+        await db.executemany('''
+            INSERT INTO monitored_products
+            (sku, store_name, product_name, product_url, last_price, current_stock_status)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(sku, store_name) DO UPDATE SET
+                product_name = COALESCE(excluded.product_name, product_name),
+                product_url = COALESCE(excluded.product_url, product_url),
+                current_stock_status = excluded.current_stock_status,
+                last_price = COALESCE(excluded.last_price, last_price),
+                last_checked = CURRENT_TIMESTAMP
+        ''', rows)
+        
+        # One history row per scanned product, same as the single-row upsert
+        await db.executemany('''
+            INSERT INTO stock_history (product_id, stock_status, price)
+            SELECT id, ?, ? FROM monitored_products WHERE sku = ? AND store_name = ?
+        ''', [(status, price, sku, store) for sku, store, _, _, price, status in rows])
+        
+        self._query_cache.invalidate()
+        self.logger.info(f"Upserted {len(rows)} products from scan")
+    
+    async def get_all_skus(self, store_names: Optional[List[str]] = None) -> Set[Tuple[str, str]]:
+        """Get active (store_name, sku) pairs for fast membership checks, optionally for some stores only"""
+        query = 'SELECT store_name, sku FROM monitored_products WHERE is_active = 1'
+        params: tuple = ()
+        if store_names is not None:
+            if not store_names:
+                return set()
+            query += f" AND store_name IN ({', '.join('?' * len(store_names))})"
+            params = tuple(store_names)
+        
+        try:
+            # Runs on the shared connection's worker thread rather than spawning a new one per call
+            db = await self.get_conn()
+            async with db.execute(query, params) as cursor:
+                return set(await cursor.fetchall())
+        except Exception as e:
+            self.logger.error(f"Error getting all SKUs: {e}")
+            return set()
+    
     async def get_products_by_store(self, store_name: str) -> List[Dict[str, Any]]:
         """Get all products for a specific store"""
         try:
@@ -256,9 +432,42 @@ class DatabaseManager:
             self.logger.error(f"Error getting products by store: {e}")
             return []
     
-    def close(self):
+    def write_lock(self) -> asyncio.Lock:
+        """Lock serializing connection setup and multi-statement transactions on the shared connection"""
+        lock = _shared_locks.get(self.db_path)
+        if lock is None:
+            # Created lazily so it binds to the running event loop
+            lock = _shared_locks[self.db_path] = asyncio.Lock()
+        return lock
+    
+    async def get_conn(self) -> aiosqlite.Connection:
+        """
+        Long-lived autocommit connection shared by every caller using this database file,
+        opened on first use with WAL and pragmas tuned for many small writes
+        """
+        conn = _shared_connections.get(self.db_path)
+        if conn is not None:
+            return conn
+        
+        async with self.write_lock():
+            conn = _shared_connections.get(self.db_path)
+            if conn is None:
+                conn = await aiosqlite.connect(self.db_path, isolation_level=None)
+                await conn.executescript(
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA temp_store=MEMORY;"
+                    "PRAGMA cache_size=-65536;"
+                )
+                _shared_connections[self.db_path] = conn
+        return conn
+    
+    async def close(self):
         """Close database connections"""
-        # aiosqlite connections are closed automatically
+        # Per-call aiosqlite connections close themselves; only the shared ones stay open
+        while _shared_connections:
+            _, conn = _shared_connections.popitem()
+            await conn.close()
         self.logger.info("Database connections closed")
     
     # Upcoming Releases Methods
@@ -376,18 +585,44 @@ class DatabaseManager:
             self.logger.error(f"Error verifying sighting: {e}")
             return False
     
-    async def get_unverified_sightings(self) -> List[Dict[str, Any]]:
-        """Get all unverified community sightings"""
+    async def get_unverified_sightings(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get unverified community sightings, newest first
+
+        With a limit only that many rows are returned; every row carries a
+        total_pending column with the full number of unverified sightings.
+        """
         try:
             async with aiosqlite.connect(self.db_path) as db:
                 db.row_factory = aiosqlite.Row
                 async with db.execute('''
-                    SELECT * FROM community_sightings 
+                    SELECT *, COUNT(*) OVER () AS total_pending FROM community_sightings 
                     WHERE is_verified = 0
                     ORDER BY reported_at DESC
-                ''') as cursor:
+                    LIMIT ?
+                ''', (-1 if limit is None else limit,)) as cursor:
                     rows = await cursor.fetchall()
                     return [dict(row) for row in rows]
         except Exception as e:
             self.logger.error(f"Error getting unverified sightings: {e}")
             return []
+    
+    # Daily Schedule Methods
+    async def upsert_daily_schedule(self, guild_id: int, channel_id: int, schedule_time: str) -> bool:
+        """Replace a guild's daily scan schedule with a new channel and HH:MM time"""
+        try:
+            db = await self.get_conn()
+            # Under the write lock so the upsert never lands inside another caller's open transaction
+            async with self.write_lock():
+                await db.execute('''
+                    INSERT INTO daily_schedules (guild_id, channel_id, schedule_time)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(guild_id) DO UPDATE SET
+                        channel_id = excluded.channel_id,
+                        schedule_time = excluded.schedule_time,
+                        is_active = 1
+                ''', (guild_id, channel_id, schedule_time))
+            self.logger.info(f"Scheduled daily scan for guild {guild_id} at {schedule_time}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error saving daily schedule: {e}")
+            return False
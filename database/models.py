@@ -32,3 +32,18 @@ class UserPreferences:
     notification_enabled: bool = True
     preferred_stores: Optional[str] = None
     created_at: Optional[datetime] = None
+
+@dataclass(frozen=True)
+class ScannedProduct:
+    """Model for a product seen during a daily store scan"""
+    store_id: str
+    store_name: str
+    name: str = 'Unknown Product'
+    url: str = ''
+    sku: str = ''
+    price: Optional[float] = None
+
+    @property
+    def key(self) -> str:
+        """SKU used for tracking, falling back to the URL when the store gave none"""
+        return self.sku or self.url
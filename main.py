@@ -5,7 +5,7 @@ from dotenv import load_dotenv
 
 from bot.discord_bot import PokemonStockBot
 from utils.config import Config
-from utils.logger import setup_logger
+from utils.logger import setup_logger, start_queue_logging
 from database.manager import DatabaseManager
 
 # Load environment variables
@@ -16,6 +16,9 @@ async def main():
     
     # Setup logging
     logger = setup_logger()
+    # Modules logging via logging.getLogger (notifications, discord.py) write
+    # through a background thread so slow handlers never block the event loop
+    log_listener = start_queue_logging()
     logger.info("Starting Pokemon Stock Bot...")
     
     # Initialize configuration
@@ -37,8 +40,9 @@ async def main():
         logger.error(f"Bot encountered an error: {e}")
     finally:
         await bot.close()
-        db_manager.close()
+        await db_manager.close()
         logger.info("Bot shutdown complete.")
+        log_listener.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())
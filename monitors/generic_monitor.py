@@ -6,23 +6,87 @@ Can handle multiple stores without individual monitor classes
 
 import re
 import asyncio
-from typing import Dict, Any, Optional, List
+import concurrent.futures
+from typing import Dict, Any, Optional, List, Union
 from bs4 import BeautifulSoup
 from monitors.base_monitor import BaseMonitor
+from utils.cache import TTLCache
+from utils import jsonio
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Raw JSON API responses keyed by URL - shared across monitor instances since
+# slash commands build a fresh monitor per invocation
+_json_response_cache = TTLCache(maxsize=32, ttl=600)
+
+# Long-lived headless Chrome for Selenium scrapes. Only touch it from the single
+# worker of _selenium_executor (go through run_on_selenium_thread).
+_selenium_driver = None
+_selenium_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='selenium')
+
+
+def get_selenium_driver():
+    """Return the shared headless Chrome driver, launching it on first use"""
+    global _selenium_driver
+    if _selenium_driver is None:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
+        # Setup Chrome options
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        
+        _selenium_driver = webdriver.Chrome(options=chrome_options)
+        _selenium_driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return _selenium_driver
+
+
+def close_selenium_driver():
+    """Quit the shared Chrome driver if one is running"""
+    global _selenium_driver
+    if _selenium_driver is not None:
+        try:
+            _selenium_driver.quit()
+        except Exception:
+            pass
+        _selenium_driver = None
+
+
+async def run_on_selenium_thread(func, *args):
+    """Run a blocking Selenium call on the one thread allowed to drive the shared browser"""
+    return await asyncio.get_running_loop().run_in_executor(_selenium_executor, func, *args)
+
+
+async def shutdown_selenium():
+    """Quit the shared Chrome driver on its own thread; call from the bot's shutdown hook"""
+    await run_on_selenium_thread(close_selenium_driver)
+
 
 class GenericStoreMonitor(BaseMonitor):
     """Generic monitor that can scrape any store based on configuration"""
     
     def __init__(self, config):
         super().__init__(config)
-        self.store_configs = self.load_store_configs()
+        self.store_configs = self._build_store_configs()
     
     def load_store_configs(self) -> Dict[str, Dict]:
-        """Load store configurations - focused on New Zealand stores"""
+        """Store configurations, built once when the monitor is created"""
+        return self.store_configs
+    
+    def reload_store_configs(self) -> Dict[str, Dict]:
+        """Rebuild store configurations, discarding stores added at runtime"""
+        self.store_configs = self._build_store_configs()
+        return self.store_configs
+    
+    def _build_store_configs(self) -> Dict[str, Dict]:
+        """Build store configurations - focused on New Zealand stores"""
         return {
             # === NEW ZEALAND STORES (Primary Focus) ===
             'novagames_nz': {
@@ -46,6 +110,7 @@ class GenericStoreMonitor(BaseMonitor):
                 'price_selectors': ['span[itemprop="price"]', 'span.price', '.price-current'],
                 'name_selector': 'h1.product-title, h1',
                 'sku_selector': 'span.r',  # <span class="r">331128</span>
+                'requests_per_second': 0.5,  # Bot detection - keep daily scan fallback requests slow
                 'stock_indicators': {
                     'in_stock': ['add to cart', 'add to wishlist'],
                     'out_of_stock': ['out of stock', 'sold out'],
@@ -335,8 +400,12 @@ class GenericStoreMonitor(BaseMonitor):
         # Default to EB Games NZ for now
         return f"https://www.ebgames.co.nz/search?q={sku}"
     
-    async def parse_nova_games_products(self, html: str, base_url: str) -> List[Dict]:
-        """Parse Nova Games product listing page"""
+    async def parse_nova_games_products(self, html: Union[str, bytes], base_url: str) -> List[Dict]:
+        """Parse Nova Games product listing page in a worker thread so the event loop stays responsive"""
+        return await asyncio.to_thread(self.parse_nova_games_products_sync, html, base_url)
+
+    def parse_nova_games_products_sync(self, html: Union[str, bytes], base_url: str) -> List[Dict]:
+        """Parse Nova Games product listing page (raw response bytes or decoded text)"""
         products = []
         
         try:
@@ -446,8 +515,12 @@ class GenericStoreMonitor(BaseMonitor):
         logger.info(f"Parsed {len(products)} Pokemon products from Nova Games")
         return products
 
-    async def parse_ebgames_products(self, html: str, base_url: str) -> List[Dict]:
-        """Parse EB Games product listing page"""
+    async def parse_ebgames_products(self, html: Union[str, bytes], base_url: str) -> List[Dict]:
+        """Parse EB Games product listing page in a worker thread so the event loop stays responsive"""
+        return await asyncio.to_thread(self.parse_ebgames_products_sync, html, base_url)
+
+    def parse_ebgames_products_sync(self, html: Union[str, bytes], base_url: str) -> List[Dict]:
+        """Parse EB Games product listing page (raw response bytes or decoded text)"""
         products = []
         
         try:
@@ -540,13 +613,12 @@ class GenericStoreMonitor(BaseMonitor):
         logger.info(f"Parsed {len(products)} Pokemon products from EB Games")
         return products
 
-    async def parse_cardmerchant_products(self, json_data: str, base_url: str) -> List[Dict]:
-        """Parse Card Merchant JSON product data"""
+    async def parse_cardmerchant_products(self, json_data: Union[str, bytes], base_url: str) -> List[Dict]:
+        """Parse Card Merchant JSON product data (raw response bytes or decoded text)"""
         products = []
         
         try:
-            import json
-            data = json.loads(json_data)
+            data = jsonio.loads(json_data)
             
             # Extract products from JSON response
             product_list = data.get('products', [])
@@ -608,26 +680,13 @@ class GenericStoreMonitor(BaseMonitor):
         
         try:
             # Import Selenium here to avoid dependency issues if not installed
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
             from selenium.webdriver.common.by import By
             from selenium.webdriver.support.ui import WebDriverWait
             from selenium.webdriver.support import expected_conditions as EC
-            from selenium.common.exceptions import TimeoutException
             import time
             
-            # Setup Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            # Reuse the warm browser from previous scans instead of launching Chrome each time
+            driver = get_selenium_driver()
             
             # Get EB Games Pokemon search page
             pokemon_url = "https://www.ebgames.co.nz/search?q=pokemon"
@@ -649,7 +708,6 @@ class GenericStoreMonitor(BaseMonitor):
             
             # Get page HTML
             page_html = driver.page_source
-            driver.quit()
             
             # Parse with BeautifulSoup
             page_soup = BeautifulSoup(page_html, "html.parser")
@@ -719,11 +777,8 @@ class GenericStoreMonitor(BaseMonitor):
             logger.error("Selenium not installed - cannot scrape EB Games")
         except Exception as e:
             logger.error(f"Error scraping EB Games with Selenium: {e}")
-            if 'driver' in locals():
-                try:
-                    driver.quit()
-                except:
-                    pass
+            # Drop the browser so the next scan starts from a fresh one
+            close_selenium_driver()
         
         logger.info(f"Parsed {len(products)} Pokemon TCG products from EB Games")
         return products
@@ -790,24 +845,28 @@ class GenericStoreMonitor(BaseMonitor):
             import aiohttp
             
             url = "https://cardmerchant.co.nz/products.json"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=30) as response:
-                    if response.status == 200:
-                        json_text = await response.text()
-                        products = await self.parse_cardmerchant_products(json_text, "https://cardmerchant.co.nz")
-                        return [
-                            {
-                                'name': p['name'],
-                                'price': p.get('price', 0.0),
-                                'url': p['url'],
-                                'sku': p.get('sku', ''),
-                                'available': p.get('status', '') == 'In Stock'
-                            }
-                            for p in products
-                        ]
-                    else:
-                        logger.error(f"Card Merchant returned status {response.status}")
-                        return []
+            json_text = _json_response_cache.get(url)
+            if json_text is None:
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url, timeout=30) as response:
+                        if response.status != 200:
+                            logger.error(f"Card Merchant returned status {response.status}")
+                            return []
+                        # Raw bytes go straight to the JSON decoder (orjson when installed) without a str copy
+                        json_text = await response.read()
+                _json_response_cache.set(url, json_text)
+            
+            products = await self.parse_cardmerchant_products(json_text, "https://cardmerchant.co.nz")
+            return [
+                {
+                    'name': p['name'],
+                    'price': p.get('price', 0.0),
+                    'url': p['url'],
+                    'sku': p.get('sku', ''),
+                    'available': p.get('status', '') == 'In Stock'
+                }
+                for p in products
+            ]
                         
         except Exception as e:
             logger.error(f"Error getting Card Merchant products: {e}")
@@ -816,17 +875,8 @@ class GenericStoreMonitor(BaseMonitor):
     async def get_ebgames_products(self) -> List[Dict[str, Any]]:
         """Get current Pokemon TCG products from EB Games NZ using Selenium"""
         try:
-            # Run Selenium in a thread to avoid blocking
-            import asyncio
-            import concurrent.futures
-            
-            def run_selenium():
-                return self.parse_ebgames_products_selenium()
-            
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                products = await asyncio.get_event_loop().run_in_executor(
-                    executor, run_selenium
-                )
+            # Run Selenium on the shared browser thread to avoid blocking
+            products = await run_on_selenium_thread(self.parse_ebgames_products_selenium)
             
             return [
                 {
@@ -839,7 +889,7 @@ class GenericStoreMonitor(BaseMonitor):
                 for p in products
             ]
         except Exception as e:
-            logger.error(f"Error getting Card Merchant products: {e}")
+            logger.error(f"Error getting EB Games products: {e}")
             return []
 
     async def get_ebgames_products_selenium(self) -> List[Dict[str, Any]]:
@@ -1,5 +1,5 @@
 import asyncio
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import logging
 
 from utils.config import Config
@@ -22,82 +22,90 @@ class MonitorManager:
     
     async def check_all_products(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Check stock for all monitored products using generic monitor"""
+        stock_changes, _ = await self.check_products(products)
+        return stock_changes
+
+    async def check_products(
+        self,
+        products: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], BaseException]]]:
+        """Check products concurrently, returning (stock changes, (product, error) failures)
+
+        One product failing never cancels the others; every failure is
+        reported back so callers can surface partial results.
+        """
         stock_changes = []
+        failures = []
+        
+        if not products:
+            return stock_changes, failures
         
         # Create semaphore to limit concurrent requests
         semaphore = asyncio.Semaphore(self.config.max_concurrent_checks)
         
-        # Check each product
-        tasks = []
-        for product in products:
-            task = self._check_single_product(semaphore, product)
-            tasks.append(task)
+        results = await asyncio.gather(
+            *[self._check_single_product(semaphore, product) for product in products],
+            return_exceptions=True
+        )
         
-        # Wait for all checks to complete
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Collect all stock changes
-            for result in results:
-                if isinstance(result, dict) and result:
-                    stock_changes.append(result)
-                elif isinstance(result, Exception):
-                    self.logger.error("Error in product check: %s", result)
+        for product, result in zip(products, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result  # Cancellation and interpreter exits are not per-product failures
+                self.logger.error("Error checking product %s: %s", product['sku'], result)
+                failures.append((product, result))
+            elif result:
+                stock_changes.append(result)
         
-        return stock_changes
+        return stock_changes, failures
 
     async def _check_single_product(
         self, 
         semaphore: asyncio.Semaphore,
         product: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Check a single product with rate limiting"""
+        """Check a single product with rate limiting (errors propagate to the caller)"""
         async with semaphore:
-            try:
-                # Add delay for rate limiting
-                await asyncio.sleep(self.config.rate_limit_delay)
-                
-                # Use generic monitor to check stock
-                stock_result = await self.generic_monitor.check_stock(
-                    product['sku'], 
-                    product.get('product_url')
+            # Add delay for rate limiting
+            await asyncio.sleep(self.config.rate_limit_delay)
+            
+            # Use generic monitor to check stock
+            stock_result = await self.generic_monitor.check_stock(
+                product['sku'], 
+                product.get('product_url')
+            )
+            
+            # Check if stock status changed
+            if stock_result['stock_status'] != product['current_stock_status']:
+                # Update database
+                await self.db_manager.update_stock_status(
+                    product['id'],
+                    stock_result['stock_status'],
+                    stock_result['price']
                 )
                 
-                # Check if stock status changed
-                if stock_result['stock_status'] != product['current_stock_status']:
-                    # Update database
-                    await self.db_manager.update_stock_status(
-                        product['id'],
-                        stock_result['stock_status'],
-                        stock_result['price']
-                    )
-                    
-                    # Return change information
-                    change = {
-                        'sku': product['sku'],
-                        'store_name': product['store_name'],
-                        'product_name': product['product_name'] or stock_result['product_name'],
-                        'product_url': product['product_url'] or stock_result['product_url'],
-                        'old_status': product['current_stock_status'],
-                        'stock_status': stock_result['stock_status'],
-                        'price': stock_result['price']
-                    }
-                    
-                    self.logger.info(
-                        "Stock change detected - %s %s: %s -> %s",
-                        product['store_name'], 
-                        product['sku'],
-                        product['current_stock_status'], 
-                        stock_result['stock_status']
-                    )
-                    
-                    return change
+                # Return change information
+                change = {
+                    'sku': product['sku'],
+                    'store_name': product['store_name'],
+                    'product_name': product['product_name'] or stock_result['product_name'],
+                    'product_url': product['product_url'] or stock_result['product_url'],
+                    'old_status': product['current_stock_status'],
+                    'stock_status': stock_result['stock_status'],
+                    'price': stock_result['price']
+                }
+                
+                self.logger.info(
+                    "Stock change detected - %s %s: %s -> %s",
+                    product['store_name'], 
+                    product['sku'],
+                    product['current_stock_status'], 
+                    stock_result['stock_status']
+                )
                 
-                return {}
+                return change
             
-            except Exception as e:
-                self.logger.error("Error checking product %s: %s", product['sku'], e)
-                return {}
+            return {}
     
     async def cleanup(self):
         """Cleanup generic monitor session"""
@@ -7,11 +7,11 @@ Check what's actually available right now across all accessible stores
 import asyncio
 import time
 import random
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 import re
 
 class NZPokemonMarketSurvey:
@@ -80,6 +80,49 @@ class NZPokemonMarketSurvey:
         print("      ❌ Cloudflare timeout")
         return False
     
+    def _extract_one(self, container, store: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Extract one product container (blocking WebDriver calls), or None if it isn't usable"""
+        try:
+            # Try to find product name
+            name = None
+            for name_selector in store['name_selectors']:
+                name_elems = container.find_elements(By.CSS_SELECTOR, name_selector)[:1]
+                name = name_elems[0].text.strip() if name_elems else None
+                if name:
+                    break
+            
+            if not name:
+                return None
+            
+            # Filter for Pokemon products only
+            if 'pokemon' not in name.lower():
+                return None
+            
+            # Extract price
+            price = "Price not available"
+            for price_selector in store['price_selectors']:
+                price_elems = container.find_elements(By.CSS_SELECTOR, price_selector)[:1]
+                price_text = price_elems[0].text.strip() if price_elems else ''
+                if price_text:
+                    price = self.extract_price(price_text)
+                    break
+            
+            # Extract URL
+            url = "URL not available"
+            link_elems = container.find_elements(By.CSS_SELECTOR, 'a')[:1]
+            href = link_elems[0].get_attribute('href') if link_elems else None
+            if href:
+                url = href if href.startswith('http') else f"https://{store['name'].lower().split()[0]}.co.nz{href}"
+            
+            return {
+                'name': name,
+                'price': price,
+                'url': url,
+                'store': store['name']
+            }
+        except Exception:
+            return None
+    
     async def survey_store(self, store_key: str) -> List[Dict[str, Any]]:
         """Survey a single store for Pokemon TCG products"""
         store = self.stores[store_key]
@@ -119,61 +162,13 @@ class NZPokemonMarketSurvey:
                 print(f"   ❌ No product containers found")
                 return products
             
-            # Extract products from containers
+            # Extract products from containers, overlapping the per-container WebDriver calls
             print(f"   🔍 Extracting products...")
-            for i, container in enumerate(containers[:25]):  # Limit for performance
-                try:
-                    # Try to find product name
-                    name = None
-                    for name_selector in store['name_selectors']:
-                        try:
-                            name_elem = container.find_element(By.CSS_SELECTOR, name_selector)
-                            name = name_elem.text.strip()
-                            if name:
-                                break
-                        except NoSuchElementException:
-                            continue
-                    
-                    if not name:
-                        continue
-                    
-                    # Filter for Pokemon products only
-                    if 'pokemon' not in name.lower():
-                        continue
-                    
-                    # Extract price
-                    price = "Price not available"
-                    for price_selector in store['price_selectors']:
-                        try:
-                            price_elem = container.find_element(By.CSS_SELECTOR, price_selector)
-                            price_text = price_elem.text.strip()
-                            if price_text:
-                                price = self.extract_price(price_text)
-                                break
-                        except NoSuchElementException:
-                            continue
-                    
-                    # Extract URL
-                    url = "URL not available"
-                    try:
-                        link_elem = container.find_element(By.CSS_SELECTOR, 'a')
-                        href = link_elem.get_attribute('href')
-                        if href:
-                            url = href if href.startswith('http') else f"https://{store['name'].lower().split()[0]}.co.nz{href}"
-                    except NoSuchElementException:
-                        pass
-                    
-                    product = {
-                        'name': name,
-                        'price': price,
-                        'url': url,
-                        'store': store['name']
-                    }
-                    
-                    products.append(product)
-                    
-                except Exception:
-                    continue
+            results = await asyncio.gather(*[
+                asyncio.to_thread(self._extract_one, container, store)
+                for container in containers[:25]  # Limit for performance
+            ])
+            products = [product for product in results if product]
             
             print(f"   ✅ Successfully extracted {len(products)} Pokemon TCG products")
             
@@ -0,0 +1,78 @@
+"""
+Small in-memory caching helpers
+"""
+import functools
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded in-memory cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting expired (then oldest) entries when full"""
+        if key not in self._data and len(self._data) >= self.maxsize:
+            self._evict()
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop a single key, or everything when no key is given"""
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def _evict(self):
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._data.items() if expires_at < now]:
+            del self._data[key]
+
+        if len(self._data) >= self.maxsize:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            del self._data[next(iter(self._data))]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def async_memoize(ttl: float = 600, key: Optional[Callable[..., Hashable]] = None, maxsize: int = 256):
+    """Decorator that caches an async function's non-empty results for ttl seconds
+
+    Empty results (None, [], {}) are not cached so a failed lookup is retried
+    on the next call instead of being pinned for the whole TTL.
+    """
+    def decorator(func: Callable):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            result = cache.get(cache_key, _MISSING)
+            if result is _MISSING:
+                result = await func(*args, **kwargs)
+                if result:
+                    cache.set(cache_key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
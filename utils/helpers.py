@@ -1,10 +1,12 @@
 import re
 import asyncio
-from typing import Optional, Dict, Any
+import functools
+from typing import Optional, Dict, Any, List
 from urllib.parse import urlparse, urljoin
 
+@functools.lru_cache(maxsize=4096)
 def clean_sku(sku: str) -> str:
-    """Clean and normalize SKU format"""
+    """Clean and normalize SKU format (pure, so results are memoized)"""
     return re.sub(r'[^\w\-]', '', sku.upper())
 
 def is_valid_url(url: str) -> bool:
@@ -25,6 +27,22 @@ def format_price(price: str) -> Optional[float]:
     except (ValueError, AttributeError):
         return None
 
+def format_product_list(store_products) -> List[str]:
+    """Format a store's (already capped) product rows for display"""
+    product_list = []
+    for product in store_products:
+        status_emoji = "🟢" if product['current_stock_status'] == 'In Stock' else "🔴"
+        product_info = f"{status_emoji} {product['sku']}"
+        if product['product_name']:
+            product_info += f" - {product['product_name'][:30]}..."
+        product_list.append(product_info)
+    
+    store_total = store_products[0]['store_total'] if store_products else 0
+    if store_total > len(store_products):
+        product_list.append(f"... and {store_total - len(store_products)} more")
+    
+    return product_list
+
 def create_embed_data(
     title: str, 
     description: str, 
@@ -0,0 +1,18 @@
+"""
+JSON decode helper that uses orjson when it is installed
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up, stdlib json is always available
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON from raw response bytes or text"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
@@ -1,6 +1,7 @@
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
 def setup_logger(name: str = 'PokemonStockBot', log_level: str = 'INFO') -> logging.Logger:
@@ -18,6 +19,10 @@ def setup_logger(name: str = 'PokemonStockBot', log_level: str = 'INFO') -> logg
     if logger.handlers:
         return logger
     
+    # This logger writes through its own handlers; don't repeat records on
+    # the root queue handler installed by start_queue_logging()
+    logger.propagate = False
+    
     # Create formatter
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -41,3 +46,22 @@ def setup_logger(name: str = 'PokemonStockBot', log_level: str = 'INFO') -> logg
     logger.addHandler(file_handler)
     
     return logger
+
+def start_queue_logging(log_level: str = 'INFO') -> QueueListener:
+    """Route root logging through a queue so console writes happen on a background thread
+
+    Callers must stop() the returned listener on shutdown to flush queued records.
+    """
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, log_level.upper()))
+    root.addHandler(QueueHandler(log_queue))
+    
+    listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,33 @@
+"""
+Token-bucket rate limiting for outgoing requests
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Async token bucket allowing `rate` acquisitions per second, bursting up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        if self._lock is None:
+            # Created lazily so it binds to the running event loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)